@@ -14,6 +14,18 @@ from .utils.pydantic_json import pydantic_dumps, pydantic_loads
 
 __version__ = version("datalad-registry")
 
+# Register JSON encoding and decoding functions with additional support of
+# Pydantic models and other supported types by Pydantic for JSON serialization.
+# The registry of serializers is process-wide, so the registration is done once
+# at import instead of every time a Celery app is produced.
+register(
+    "pydantic_json",
+    pydantic_dumps,
+    pydantic_loads,
+    content_type="application/x-pydantic-json",
+    content_encoding="utf-8",
+)
+
 
 def create_app() -> Flask:
     """
@@ -109,16 +121,6 @@ def celery_init_app(flask_app: Flask) -> Celery:
     celery_app = Celery(flask_app.name, task_cls=FlaskTask)
     celery_app.config_from_object(flask_app.config["CELERY"])
 
-    # Register JSON encoding and decoding functions with additional support of
-    # Pydantic models and other supported types by Pydantic for JSON serialization
-    register(
-        "pydantic_json",
-        pydantic_dumps,
-        pydantic_loads,
-        content_type="application/x-pydantic-json",
-        content_encoding="utf-8",
-    )
-
     # Set the Celery app to use the JSON serializer registered above
     celery_app.conf.update(
         accept_content=["pydantic_json"],
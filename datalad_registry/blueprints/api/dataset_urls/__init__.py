@@ -1,18 +1,21 @@
 # This file is for defining the API endpoints related to dataset URls
 
+from itertools import chain
 from json import loads
 import operator
 from pathlib import Path
+from typing import Any, Optional, Union
 
 from celery import group
-from flask import abort, current_app, url_for
+from flask import abort, current_app, request, url_for
 from flask_openapi3 import APIBlueprint, Tag
 from lark.exceptions import GrammarError, UnexpectedInput
 from psycopg2.errors import UniqueViolation
-from sqlalchemy import ColumnElement, and_, select
+from sqlalchemy import ColumnElement, Text, and_, func, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 
-from datalad_registry.models import RepoUrl, db
+from datalad_registry.models import RepoUrl, URLMetadata, db
 from datalad_registry.search import parse_query
 from datalad_registry.tasks import (
     extract_ds_meta,
@@ -39,7 +42,7 @@ from .. import (
     DATASET_URLS_PATH,
     HTTPExceptionResp,
 )
-from ..url_metadata.models import URLMetadataRef
+from ..url_metadata.models import URLMetadataModel, URLMetadataRef
 from ..utils import disable_in_read_only_mode
 
 _ORDER_KEY_TO_SQLA_ATTR = {
@@ -51,6 +54,104 @@ _ORDER_KEY_TO_SQLA_ATTR = {
     OrderKey.git_objects_kb: RepoUrl.git_objects_kb,
 }
 
+# Names of the fields of the response models that are populated directly from
+# the corresponding attributes of the ORM objects
+_DS_URL_RESP_BASE_FIELDS = tuple(DatasetURLRespBaseModel.__fields__)
+_URL_METADATA_FIELDS = tuple(URLMetadataModel.__fields__)
+
+# The JSON representation of a `RepoUrl`, in accordance with
+# `DatasetURLRespBaseModel`, built by the database. Fields with null values are
+# excluded from the representation.
+# Note: The representation is retrieved as text since `db.paginate()` requires
+#       hashable values in the results.
+_DS_URL_JSON = (
+    func.jsonb_strip_nulls(
+        func.jsonb_build_object(
+            *chain.from_iterable(
+                (f, getattr(RepoUrl, f)) for f in _DS_URL_RESP_BASE_FIELDS
+            )
+        )
+    )
+    .cast(Text)
+    .label("ds_url_json")
+)
+
+
+def _construct_url_metadata_model(url_metadata: URLMetadata) -> URLMetadataModel:
+    """
+    Construct a `URLMetadataModel` from a `URLMetadata` ORM object without validation
+
+    Note: The data in the ORM object is from the database and conforms to
+          `URLMetadataModel` already. Validation is only needed for data from
+          an untrusted source.
+    """
+    return URLMetadataModel.construct(
+        **{f: getattr(url_metadata, f) for f in _URL_METADATA_FIELDS}
+    )
+
+
+def _construct_ds_url_resp_model(
+    repo_url: RepoUrl,
+    metadata: Optional[Union[list[URLMetadataModel], list[URLMetadataRef]]],
+) -> DatasetURLRespModel:
+    """
+    Construct a `DatasetURLRespModel` from a `RepoUrl` ORM object without validation
+
+    :param repo_url: The `RepoUrl` ORM object
+    :param metadata: The value for the `metadata` field of the model to construct
+
+    Note: The data in the ORM object is from the database and conforms to
+          `DatasetURLRespModel` already. Validation is only needed for data from
+          an untrusted source.
+    """
+    return DatasetURLRespModel.construct(
+        **{f: getattr(repo_url, f) for f in _DS_URL_RESP_BASE_FIELDS},
+        metadata=metadata,
+    )
+
+
+def _ds_url_resp_dict(
+    repo_url: RepoUrl, metadata: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """
+    Build the representation of a `RepoUrl` ORM object, in accordance with
+    `DatasetURLRespModel`, as a dictionary
+
+    :param repo_url: The `RepoUrl` ORM object
+    :param metadata: The value for the `metadata` field of the representation
+
+    Note: Fields with null values are excluded from the representation, consistent
+          with `_DS_URL_JSON`.
+    Note: Building the representation as a dictionary, instead of as a model object,
+          spares the allocation of a model object for each dataset URL and
+          the conversion of it back to a dictionary for serialization.
+    """
+    ds_url = {
+        f: v
+        for f in _DS_URL_RESP_BASE_FIELDS
+        if (v := getattr(repo_url, f)) is not None
+    }
+    ds_url["metadata"] = metadata
+    return ds_url
+
+
+def _url_metadata_resp_dict(url_metadata: URLMetadata) -> dict[str, Any]:
+    """
+    Build the representation of a `URLMetadata` ORM object, in accordance with
+    `URLMetadataModel`, as a dictionary
+
+    :param url_metadata: The `URLMetadata` ORM object
+
+    Note: Fields with null values are excluded from the representation, consistent
+          with `_ds_url_resp_dict`.
+    """
+    return {
+        f: v
+        for f in _URL_METADATA_FIELDS
+        if (v := getattr(url_metadata, f)) is not None
+    }
+
+
 bp = APIBlueprint(
     "dataset_urls_api",
     __name__,
@@ -286,62 +387,91 @@ def dataset_urls(query: QueryParams):
     ep = ".dataset_urls"  # Endpoint of `dataset_urls`
     base_qry = loads(query.json(exclude={"page"}, exclude_none=True))
 
+    # Note: The values of the query parameters enter the statement as bound
+    #       parameters. The statement, and the statements derived from it for
+    #       the page and the collection stats, are compiled only once for each
+    #       combination of the given query parameters and then reused from
+    #       the compiled cache of SQLAlchemy. (See
+    #       `DATALAD_REGISTRY_SQLA_QUERY_CACHE_SIZE`.)
     base_select_stmt = select(RepoUrl).filter(and_(True, *constraints))
 
+    order_by_clause = getattr(
+        _ORDER_KEY_TO_SQLA_ATTR[query.order_by], query.order_dir.value
+    )().nulls_last()
+
     max_per_page = 100  # The overriding limit to `per_page` provided by the requester
-    pagination = db.paginate(
-        base_select_stmt.order_by(
-            getattr(
-                _ORDER_KEY_TO_SQLA_ATTR[query.order_by], query.order_dir.value
-            )().nulls_last()
-        ),
-        page=query.page,
-        per_page=query.per_page,
-        max_per_page=max_per_page,
-    )
-    orm_ds_urls = pagination.items
-    cur_pg_num = pagination.page
-    total_pages = pagination.pages  # Total number of pages
 
+    collection_stats = get_collection_stats(base_select_stmt)
+
+    # The representations of the dataset URLs in the page, as dictionaries
+    ds_urls: list[dict[str, Any]]
     if query.return_metadata is None:
         # === No metadata should be returned ===
 
-        # noinspection PyArgumentList
-        ds_urls = [
-            DatasetURLRespModel(
-                **DatasetURLRespBaseModel.from_orm(i).dict(), metadata_=None
-            )
-            for i in orm_ds_urls
-        ]
-
-    elif query.return_metadata is MetadataReturnOption.reference:
-        # === Metadata should be returned by reference ===
-
-        # noinspection PyArgumentList
-        ds_urls = [
-            DatasetURLRespModel(
-                **DatasetURLRespBaseModel.from_orm(i).dict(),
-                metadata_=[
-                    URLMetadataRef(
-                        extractor_name=j.extractor_name,
-                        link=url_for(
-                            "url_metadata_api.url_metadata", url_metadata_id=j.id
-                        ),
-                    )
-                    for j in i.metadata_
-                ],
-            )
-            for i in orm_ds_urls
-        ]
+        # Have the database build the JSON representations of the dataset URLs
+        pagination = db.paginate(
+            base_select_stmt.with_only_columns(_DS_URL_JSON).order_by(order_by_clause),
+            page=query.page,
+            per_page=query.per_page,
+            max_per_page=max_per_page,
+            count=False,
+        )
+        ds_urls = [loads(i) for i in pagination.items]
 
     else:
-        # === Metadata should be returned by content ===
+        # Load the metadata of all the dataset URLs in the page in a single
+        # additional query instead of one query per dataset URL
+        pagination = db.paginate(
+            base_select_stmt.order_by(order_by_clause).options(
+                selectinload(RepoUrl.metadata_)
+            ),
+            page=query.page,
+            per_page=query.per_page,
+            max_per_page=max_per_page,
+            count=False,
+        )
+        orm_ds_urls = pagination.items
+
+        if query.return_metadata is MetadataReturnOption.reference:
+            # === Metadata should be returned by reference ===
+
+            ds_urls = [
+                _ds_url_resp_dict(
+                    i,
+                    [
+                        {
+                            "extractor_name": j.extractor_name,
+                            "link": url_for(
+                                "url_metadata_api.url_metadata", url_metadata_id=j.id
+                            ),
+                        }
+                        for j in i.metadata_
+                    ],
+                )
+                for i in orm_ds_urls
+            ]
 
-        ds_urls = orm_ds_urls
+        else:
+            # === Metadata should be returned by content ===
+
+            ds_urls = [
+                _ds_url_resp_dict(
+                    i,
+                    [_url_metadata_resp_dict(j) for j in i.metadata_],
+                )
+                for i in orm_ds_urls
+            ]
 
-    assert pagination.total is not None
+    # The pagination is done without a query counting the dataset URLs in
+    # the collection (`count=False`). The count is in the statistics of the collection.
+    pagination.total = collection_stats["summary"]["ds_count"]
 
-    page = DatasetURLPage(
+    cur_pg_num = pagination.page
+    total_pages = pagination.pages  # Total number of pages
+
+    # All the components of the page are from trusted sources, the database and
+    # the app itself, so the page is constructed without validation
+    page = DatasetURLPage.construct(
         cur_pg_num=cur_pg_num,
         prev_pg=(
             url_for(ep, **base_qry, page=pagination.prev_num)
@@ -356,7 +486,7 @@ def dataset_urls(query: QueryParams):
         first_pg=url_for(ep, **base_qry, page=1),
         last_pg=url_for(ep, **base_qry, page=1 if total_pages == 0 else total_pages),
         dataset_urls=ds_urls,
-        collection_stats=get_collection_stats(base_select_stmt),
+        collection_stats=collection_stats,
     )
 
     return json_resp_from_str(page.json(exclude_none=True))
@@ -366,6 +496,16 @@ def dataset_urls(query: QueryParams):
 def dataset_url(path: PathParams):
     """
     Get a dataset URL by ID.
+
+    The response carries an ETag of its body. A request with an `If-None-Match`
+    header matching the ETag is responded with a `304 Not Modified` response without
+    a body.
     """
-    ds_url = DatasetURLRespModel.from_orm(db.get_or_404(RepoUrl, path.id))
-    return json_resp_from_str(ds_url.json(exclude_none=True))
+    repo_url = db.get_or_404(RepoUrl, path.id)
+    ds_url = _construct_ds_url_resp_model(
+        repo_url, [_construct_url_metadata_model(i) for i in repo_url.metadata_]
+    )
+
+    resp = json_resp_from_str(ds_url.json(exclude_none=True))
+    resp.add_etag()
+    return resp.make_conditional(request)
@@ -17,20 +17,15 @@ from pydantic import (
 )
 
 from datalad_registry.utils import StrEnum
+from datalad_registry.utils.pydantic_tls import path_url_must_be_absolute
 
 from ..url_metadata.models import URLMetadataModel, URLMetadataRef
 
 DEFAULT_PAGE = 1  # Default page query param value
 DEFAULT_PER_PAGE = 20  # Default per_page query param value
 
-
-def path_url_must_be_absolute(url):
-    """
-    Validator for the path URL field that ensures that the URL is absolute
-    """
-    if isinstance(url, Path) and not url.is_absolute():
-        raise ValueError("Path URLs must be absolute")
-    return url
+# The type of a dataset URL, shared by all the models with a URL field
+URLOrPath = Union[FileUrl, AnyUrl, Path]
 
 
 class OrderDir(StrEnum):
@@ -88,7 +83,7 @@ class QueryParams(BaseModel):
         regex=r".*\S.*",
     )
 
-    url: Optional[Union[FileUrl, AnyUrl, Path]] = Field(None, description="The URL")
+    url: Optional[URLOrPath] = Field(None, description="The URL")
 
     ds_id: Optional[UUID] = Field(None, description="The ID, a UUID, of the dataset")
 
@@ -188,12 +183,22 @@ class QueryParams(BaseModel):
     )
 
 
-class DatasetURLSubmitModel(BaseModel):
+class DatasetURLBase(BaseModel):
     """
-    Model for representing the database model RepoUrl for submission communication
+    Base model for models representing the database model RepoUrl
+
+    Note: This model has no validator on the URL so that response models, which are
+          populated from the database, don't re-validate URLs that have already
+          been validated upon submission.
     """
 
-    url: Union[FileUrl, AnyUrl, Path] = Field(..., description="The URL")
+    url: URLOrPath = Field(..., description="The URL")
+
+
+class DatasetURLSubmitModel(DatasetURLBase):
+    """
+    Model for representing the database model RepoUrl for submission communication
+    """
 
     # Validator
     _path_url_must_be_absolute = validator("url", allow_reuse=True)(
@@ -201,7 +206,7 @@ class DatasetURLSubmitModel(BaseModel):
     )
 
 
-class DatasetURLRespBaseModel(DatasetURLSubmitModel):
+class DatasetURLRespBaseModel(DatasetURLBase):
     """
     Base model for `DatasetURLRespModel`
 
@@ -1,47 +1,49 @@
+from typing import Any, Union
+
 from sqlalchemy import (
     CTE,
-    ScalarSelect,
+    ColumnElement,
+    FunctionElement,
     Select,
     Subquery,
     and_,
     func,
     not_,
-    or_,
     select,
 )
 
-from datalad_registry.models import RepoUrl, db
-
-from .models import CollectionStats
+from datalad_registry.models import db
 
 
-def _get_annex_ds_collection_stats(q: Subquery) -> ScalarSelect:
+def _get_annex_ds_collection_stats(
+    q: Union[CTE, Subquery], cond: ColumnElement[bool]
+) -> FunctionElement:
     """
-    Get the stats of a collection of datasets that contains only of annex datasets
+    Get the stats of the subset of a collection of datasets that contains only
+    of annex datasets satisfying a given condition
 
-    :param q: The query that specifies the collection of datasets under consideration
-    :return: The scalar selectable for obtaining the stats
+    :param q: The CTE or subquery that specifies the collection of datasets
+              under consideration
+    :param cond: The condition that selects the annex datasets, from the collection,
+                 to be included in the stats
+    :return: The JSON object expression for obtaining the stats. The aggregates in
+             the expression are filtered by the given condition so that the stats
+             can be computed in the same pass over `q` as other stats.
 
     Note: The execution of this function requires the Flask app's context
     """
 
-    return (
-        select(
-            func.jsonb_build_object(
-                "ds_count",
-                func.count(),
-                "annexed_files_size",
-                func.sum(q.c.annexed_files_in_wt_size),
-                "annexed_file_count",
-                func.sum(q.c.annexed_files_in_wt_count),
-            ).label("annex_ds_collection_stats")
-        )
-        .select_from(q)
-        .scalar_subquery()
+    return func.jsonb_build_object(
+        "ds_count",
+        func.count().filter(cond),
+        "annexed_files_size",
+        func.sum(q.c.annexed_files_in_wt_size).filter(cond),
+        "annexed_file_count",
+        func.sum(q.c.annexed_files_in_wt_count).filter(cond),
     )
 
 
-def get_unique_dl_ds_collection_stats(base_cte: CTE) -> ScalarSelect:
+def get_unique_dl_ds_collection_stats(base_cte: CTE) -> CTE:
     """
     Get the stats of the subset of the collection of datasets that contains only
     of Datalad datasets, considering datasets with the same `ds_id` as the same
@@ -49,179 +51,117 @@ def get_unique_dl_ds_collection_stats(base_cte: CTE) -> ScalarSelect:
 
     :param base_cte: The base CTE that specified the collection of datasets
         under consideration
-    :return: The scalar selectable for obtaining the stats
+    :return: The CTE for obtaining the stats. The CTE has a single row with
+             the column `unique_dl_ds_collection_stats`, the stats, and the column
+             `ds_count`, the number of unique Datalad datasets, which is also
+             available in the stats, as a plain integer. It is materialized so that
+             the stats are computed only once however many times the CTE is
+             referenced.
 
     Note: The execution of this function requires the Flask app's context
+    Note: Among the repos of the same dataset, the one with the largest size of
+          annexed files, and then the largest number of annexed files, represents
+          the dataset in the stats.
     """
 
-    grp_by_id_q = (
-        select(
-            base_cte.c.ds_id,
-            func.max(base_cte.c.annexed_files_in_wt_size).label(
-                "max_annexed_files_in_wt_size"
-            ),
-        )
-        .group_by(base_cte.c.ds_id)
-        .subquery("grp_by_id_q")
-    )
-
-    grp_by_id_and_a_f_size_q = (
+    # Rank the repos of each Datalad dataset in a single pass over `base_cte`
+    ranked_dl_ds_q = (
         select(
-            RepoUrl.ds_id,
-            RepoUrl.annexed_files_in_wt_size,
-            func.max(RepoUrl.annexed_files_in_wt_count).label(
-                "annexed_files_in_wt_count"
-            ),
-        )
-        .join(
-            grp_by_id_q,
-            and_(
-                RepoUrl.ds_id == grp_by_id_q.c.ds_id,
-                or_(
-                    grp_by_id_q.c.max_annexed_files_in_wt_size.is_(None),
-                    RepoUrl.annexed_files_in_wt_size
-                    == grp_by_id_q.c.max_annexed_files_in_wt_size,
+            base_cte.c.annexed_files_in_wt_size,
+            base_cte.c.annexed_files_in_wt_count,
+            func.row_number()
+            .over(
+                partition_by=base_cte.c.ds_id,
+                order_by=(
+                    base_cte.c.annexed_files_in_wt_size.desc().nulls_last(),
+                    base_cte.c.annexed_files_in_wt_count.desc().nulls_last(),
                 ),
-            ),
-        )
-        .group_by(RepoUrl.ds_id, RepoUrl.annexed_files_in_wt_size)
-        .subquery("grp_by_id_and_a_f_size_q")
-    )
-
-    return _get_annex_ds_collection_stats(grp_by_id_and_a_f_size_q)
-
-
-def get_dl_ds_collection_stats_with_dups(base_cte: CTE) -> ScalarSelect:
-    """
-    Get the stats of the subset of the collection of datasets that contains only
-    of Datalad datasets, considering individual repos as a dataset regardless of
-    the value of `ds_id`.
-
-    :param base_cte: The base CTE that specified the collection of datasets
-                     under consideration
-    :return: The scalar selectable for obtaining the stats
-
-    Note: The execution of this function requires the Flask app's context
-    """
-
-    # Select statement for getting all the Datalad datasets
-    dl_ds_q = select(base_cte).filter(base_cte.c.ds_id.is_not(None)).subquery("dl_ds_q")
-
-    return _get_annex_ds_collection_stats(dl_ds_q)
-
-
-def get_dl_ds_collection_stats(base_cte: CTE) -> ScalarSelect:
-    """
-    Get the stats of the subset of the collection of datasets that contains only
-    of Datalad datasets
-
-    :param base_cte: The base CTE that specified the collection of datasets
-        under consideration
-    :return: The scalar selectable for obtaining the stats
-
-    Note: The execution of this function requires the Flask app's context
-    """
-
-    return select(
-        func.jsonb_build_object(
-            "unique_ds_stats",
-            get_unique_dl_ds_collection_stats(base_cte),
-            "stats",
-            get_dl_ds_collection_stats_with_dups(base_cte),
-        ).label("datalad_ds_collection_stats")
-    ).scalar_subquery()
-
-
-def get_pure_annex_ds_collection_stats(base_cte: CTE) -> ScalarSelect:
-    """
-    Get the stats of the subset of the collection of datasets that contains only
-    of pure annex datasets, the annex datasets that are not Datalad datasets
-
-    :param base_cte: The base CTE that specified the collection of datasets
-                     under consideration
-    :return: The scalar selectable for obtaining the stats
-
-    Note: The execution of this function requires the Flask app's context
-    """
-    # Select statement for getting all the pure annex datasets
-    pure_annex_ds_q = (
-        select(base_cte)
-        .filter(
-            and_(base_cte.c.branches.has_key("git-annex"), base_cte.c.ds_id.is_(None))
+            )
+            .label("rank"),
         )
-        .subquery("pure_annex_ds_q")
+        .filter(base_cte.c.ds_id.is_not(None))
+        .subquery("ranked_dl_ds_q")
     )
 
-    return _get_annex_ds_collection_stats(pure_annex_ds_q)
-
-
-def get_non_annex_ds_collection_stats(base_cte: CTE) -> ScalarSelect:
-    """
-    Get the stats of the subset of the collection of datasets that contains only
-    of non-annex datasets
-
-    :param base_cte: The base CTE that specified the collection of datasets
-        under consideration
-    :return: The scalar selectable for obtaining the stats
-
-    Note: The execution of this function requires the Flask app's context
-    """
-    # Select statement for getting all the non-annex datasets
-    non_annex_ds_q = (
-        select(base_cte)
-        .filter(not_(base_cte.c.branches.has_key("git-annex")))
-        .subquery("non_annex_ds_q")
-    )
+    is_top_ranked = ranked_dl_ds_q.c.rank == 1
 
     return (
         select(
-            func.jsonb_build_object("ds_count", func.count()).label(
-                "non_annex_ds_collection_stats"
-            )
+            _get_annex_ds_collection_stats(ranked_dl_ds_q, is_top_ranked).label(
+                "unique_dl_ds_collection_stats"
+            ),
+            func.count().filter(is_top_ranked).label("ds_count"),
         )
-        .select_from(non_annex_ds_q)
-        .scalar_subquery()
+        .select_from(ranked_dl_ds_q)
+        .cte("unique_dl_ds_stats_cte")
+        .prefix_with("MATERIALIZED")
     )
 
 
-def get_collection_stats(select_stmt: Select) -> CollectionStats:
+def get_collection_stats(select_stmt: Select) -> dict[str, Any]:
     """
     Get the statistics of the collection of dataset URLs specified by the given select
     statement
 
     :param select_stmt: The given select statement
-    :return: The statistics of the collection of dataset URLs
+    :return: The statistics of the collection of dataset URLs as a dictionary
+             conforming to `CollectionStats`
 
     Note: The execution of this function requires the Flask app's context
+    Note: The statistics are built by the database from typed columns. They are
+          returned without validation through `CollectionStats`.
+    Note: Except for the stats of unique Datalad datasets, which require ranking
+          the repos of each `ds_id`, all the statistics are computed by filtered
+          aggregates in a single pass over the collection of dataset URLs.
+    Note: Statistics that are not available, e.g. the annexed files size of an
+          empty subset of the collection, are absent from the returned dictionary
+          rather than being `None`, as in `CollectionStats.json(exclude_none=True)`.
     """
 
-    base_cte = select_stmt.cte("base_cte")
+    # The CTE is referenced more than once in the statement. Have it materialized so
+    # that the collection, which can be specified by a complex filter, is computed
+    # only once. (Since PostgreSQL 12, a CTE is inlined by default.)
+    base_cte = select_stmt.cte("base_cte").prefix_with("MATERIALIZED")
 
-    datalad_ds_stats_scalar_subq = get_dl_ds_collection_stats(base_cte)
+    # Conditions partitioning the collection of datasets
+    is_dl_ds = base_cte.c.ds_id.is_not(None)
+    is_annex_ds = base_cte.c.branches.has_key("git-annex")
+    is_pure_annex_ds = and_(is_annex_ds, base_cte.c.ds_id.is_(None))
+    is_non_annex_ds = not_(is_annex_ds)
 
-    # Total number of datasets, as individual repos, without any deduplication
-    ds_count_scalar_subq = select(func.count()).select_from(base_cte).scalar_subquery()
+    unique_dl_ds_stats_cte = get_unique_dl_ds_collection_stats(base_cte)
+    unique_dl_ds_stats_scalar_subq = select(
+        unique_dl_ds_stats_cte.c.unique_dl_ds_collection_stats
+    ).scalar_subquery()
 
-    return CollectionStats.parse_obj(
-        db.session.execute(
-            select(
+    return db.session.execute(
+        select(
+            # Remove the fields with null values at all levels
+            func.jsonb_strip_nulls(
                 func.jsonb_build_object(
                     "datalad_ds_stats",
-                    datalad_ds_stats_scalar_subq,
+                    func.jsonb_build_object(
+                        "unique_ds_stats",
+                        unique_dl_ds_stats_scalar_subq,
+                        "stats",
+                        _get_annex_ds_collection_stats(base_cte, is_dl_ds),
+                    ),
                     "pure_annex_ds_stats",
-                    get_pure_annex_ds_collection_stats(base_cte),
+                    _get_annex_ds_collection_stats(base_cte, is_pure_annex_ds),
                     "non_annex_ds_stats",
-                    get_non_annex_ds_collection_stats(base_cte),
+                    func.jsonb_build_object(
+                        "ds_count", func.count().filter(is_non_annex_ds)
+                    ),
                     "summary",
                     func.jsonb_build_object(
                         "unique_ds_count",
-                        func.jsonb_extract_path(
-                            datalad_ds_stats_scalar_subq, "unique_ds_stats", "ds_count"
-                        ),
+                        select(unique_dl_ds_stats_cte.c.ds_count).scalar_subquery(),
+                        # Total number of datasets, as individual repos,
+                        # without any deduplication
                         "ds_count",
-                        ds_count_scalar_subq,
+                        func.count(),
                     ),
-                ).label("collection_stats")
-            )
-        ).scalar_one()
-    )
+                )
+            ).label("collection_stats")
+        ).select_from(base_cte)
+    ).scalar_one()
@@ -1,9 +1,14 @@
 # This file is for defining the API endpoints related to dataset URL metadata,
 # i.e. the metadata of datasets at individual URLs.
 
+from itertools import chain
+
+from flask import abort
 from flask_openapi3 import APIBlueprint, Tag
+from sqlalchemy import Text, bindparam, func, select
 
 from datalad_registry.models import URLMetadata, db
+from datalad_registry.utils.flask_tools import json_resp_from_str
 
 from .models import PathParams, URLMetadataModel
 from .. import API_URL_PREFIX, COMMON_API_RESPONSES, URL_METADATA_PATH
@@ -16,11 +21,33 @@ bp = APIBlueprint(
     abp_responses=COMMON_API_RESPONSES,
 )
 
+# Statement for selecting the JSON representation of a piece of URL metadata,
+# built by the database, by ID. Only the columns needed for the representation are
+# fetched, and no ORM entity is loaded. The statement is constructed once
+# and reused with the ID bound at execution.
+_URL_METADATA_JSON_STMT = select(
+    func.jsonb_build_object(
+        *chain.from_iterable(
+            (field, getattr(URLMetadata, field))
+            for field in URLMetadataModel.__fields__
+        )
+    ).cast(Text)
+).where(URLMetadata.id == bindparam("url_metadata_id"))
+
 
 @bp.get("/<int:url_metadata_id>", responses={"200": URLMetadataModel})
 def url_metadata(path: PathParams):
     """
     Get URL metadata by ID.
     """
-    data = URLMetadataModel.from_orm(db.get_or_404(URLMetadata, path.url_metadata_id))
-    return data.dict()
+    # The data is from the database and conforms to `URLMetadataModel` already.
+    # There is no need to load it into Python objects, or to validate it through
+    # the model, only to serialize it back to JSON.
+    data = db.session.execute(
+        _URL_METADATA_JSON_STMT, {"url_metadata_id": path.url_metadata_id}
+    ).scalar_one_or_none()
+
+    if data is None:
+        abort(404)
+
+    return json_resp_from_str(data)
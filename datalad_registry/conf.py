@@ -7,6 +7,7 @@ from pydantic import (
     BaseSettings,
     NonNegativeInt,
     PositiveFloat,
+    PositiveInt,
     PostgresDsn,
     validator,
 )
@@ -89,6 +90,16 @@ class BaseConfig(OperationConfig):
 
     SQLALCHEMY_DATABASE_URI: PostgresDsn
 
+    # The size of the cache of SQLAlchemy for compiled SQL statements. A statement
+    # of the same structure, e.g. a query from the same set of API query parameters,
+    # is compiled only once as long as its compiled form stays in this cache.
+    DATALAD_REGISTRY_SQLA_QUERY_CACHE_SIZE: PositiveInt = 1200
+
+    # noinspection PyPep8Naming
+    @property
+    def SQLALCHEMY_ENGINE_OPTIONS(self) -> dict[str, Any]:
+        return dict(query_cache_size=self.DATALAD_REGISTRY_SQLA_QUERY_CACHE_SIZE)
+
     TESTING: bool = False
 
     _path_must_be_absolute = validator(
@@ -64,6 +64,30 @@ class RepoUrl(db.Model):  # type: ignore
         "URLMetadata", back_populates="url", cascade_backrefs=False
     )
 
+    __table_args__ = (
+        # Partial index on the `ds_id` of DataLad datasets for the lookup of
+        # the repos of the same dataset, e.g. in computing the stats of unique
+        # DataLad datasets
+        db.Index(
+            "ix_repo_url_ds_id_not_null",
+            ds_id,
+            postgresql_where=ds_id.is_not(None),
+        ),
+        # Index in the default order of the listing of dataset URLs for fetching
+        # a page of the listing without sorting the whole collection
+        db.Index(
+            "ix_repo_url_last_update_dt_desc_nulls_last",
+            last_update_dt.desc().nulls_last(),
+        ),
+        # Partial index for filtering dataset URLs by a range of the size of
+        # the annexed files in the working tree
+        db.Index(
+            "ix_repo_url_annexed_files_in_wt_size_not_null",
+            annexed_files_in_wt_size,
+            postgresql_where=annexed_files_in_wt_size.is_not(None),
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<RepoUrl(url={self.url!r}, ds_id={self.ds_id!r})>"
 
@@ -107,6 +131,12 @@ class URLMetadata(db.Model):  # type: ignore
 
     url = db.relationship("RepoUrl", back_populates="metadata_", cascade_backrefs=False)
 
+    __table_args__ = (
+        # Index for the lookup of the metadata of the dataset at a URL, optionally
+        # by a specific extractor
+        db.Index("ix_url_metadata_url_id_extractor_name", url_id, extractor_name),
+    )
+
     def __repr__(self) -> str:
         return (
             f"<URLMetadata(url={self.url.url!r}, extractor={self.extractor_name!r})> "
@@ -6,9 +6,10 @@ import logging
 from flask import Blueprint, render_template, request
 from humanize import intcomma
 from sqlalchemy import nullslast, select
+from sqlalchemy.orm import selectinload
 
 from datalad_registry.blueprints.api.dataset_urls.tools import get_collection_stats
-from datalad_registry.models import RepoUrl, db
+from datalad_registry.models import RepoUrl, URLMetadata, db
 from datalad_registry.search import parse_query
 
 lgr = logging.getLogger(__name__)
@@ -67,7 +68,16 @@ def overview():  # No type hints due to mypy#7187.
     )
 
     # Paginate
-    pagination = db.paginate(select_stmt)
+    # Note: The metadata of the dataset URLs in the page, of which only the IDs and
+    #       the extractor names are shown, are loaded in one query instead of
+    #       a query per dataset URL
+    pagination = db.paginate(
+        select_stmt.options(
+            selectinload(RepoUrl.metadata_).load_only(
+                URLMetadata.id, URLMetadata.extractor_name
+            )
+        )
+    )
 
     # Gather stats of the returned collection of datasets
     stats = get_collection_stats(base_select_stmt)
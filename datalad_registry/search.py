@@ -1,7 +1,7 @@
 """Functionality for support of ad-hoc search "language".
 """
 
-from functools import partial
+from functools import lru_cache, partial
 import logging
 
 from lark import GrammarError, Lark, Token, Transformer, Tree, v_args
@@ -255,6 +255,10 @@ class SearchQueryTransformer(Transformer):
         )
 
 
+# The results are cached for the parsing with the "earley" parser is costly, and
+# the same search query is often repeated, e.g. in navigating the pages of its results.
+# (The returned SQLAlchemy expressions are immutable and can be safely reused.)
+@lru_cache(maxsize=256)
 def parse_query(query: str) -> ColumnElement[bool]:
     """Parse the search query and return the SQLAlchemy expression.
 
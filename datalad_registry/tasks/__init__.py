@@ -2,10 +2,10 @@ from datetime import datetime, timedelta, timezone
 from enum import auto
 from itertools import chain
 import json
-from pathlib import Path
+import os
 from typing import Optional, TypedDict
 
-from celery import shared_task
+from celery import group, shared_task
 from celery.utils.log import get_task_logger
 from datalad import api as dl
 from datalad.api import Dataset
@@ -13,21 +13,20 @@ from datalad.distribution.dataset import require_dataset
 from datalad.support.exceptions import IncompleteResultsError
 from datalad.utils import rmtree as rm_ds_tree
 from flask import current_app
-from pydantic import StrictInt, StrictStr, parse_obj_as, validate_arguments
+from pydantic import StrictInt, validate_arguments
 import requests
-from sqlalchemy import and_, case, not_, or_, select
+from sqlalchemy import and_, case, func, not_, or_, select, update
 from yarl import URL
 
-from datalad_registry.com_models import MetaExtractResult
 from datalad_registry.models import RepoUrl, URLMetadata, db
 from datalad_registry.utils import StrEnum
 from datalad_registry.utils.datalad_tls import (
     clone,
+    get_annex_info,
     get_head_describe,
-    get_origin_annex_key_count,
+    get_head_hexsha,
     get_origin_annex_uuid,
-    get_origin_branches,
-    get_wt_annexed_file_info,
+    get_origin_ref_info,
 )
 
 from .utils import allocate_ds_path, update_ds_clone, validate_url_is_processed
@@ -89,39 +88,50 @@ def _update_dataset_url_info(dataset_url: RepoUrl, ds: Dataset) -> None:
         else None
     )
 
-    dataset_url.annex_key_count = get_origin_annex_key_count(ds)
-
-    if (wt_annexed_file_info := get_wt_annexed_file_info(ds)) is not None:
-        dataset_url.annexed_files_in_wt_count = wt_annexed_file_info.count
-        dataset_url.annexed_files_in_wt_size = wt_annexed_file_info.size
+    if (annex_info := get_annex_info(ds)) is not None:
+        dataset_url.annex_key_count = annex_info.origin_annex_key_count
+        dataset_url.annexed_files_in_wt_count = annex_info.wt_annexed_file_info.count
+        dataset_url.annexed_files_in_wt_size = annex_info.wt_annexed_file_info.size
     else:
+        dataset_url.annex_key_count = None
         dataset_url.annexed_files_in_wt_count = None
         dataset_url.annexed_files_in_wt_size = None
 
-    dataset_url.head = ds.repo.get_hexsha("origin/HEAD")
-    dataset_url.head_describe = get_head_describe(ds)
+    origin_ref_info = get_origin_ref_info(ds)
+    tags = json.dumps(origin_ref_info.tags)
 
-    dataset_url.branches = get_origin_branches(ds)
+    # The output of `git describe`, which can be costly to obtain, is determined by
+    # the HEAD commit and the tags. Reuse the recorded output if neither has changed.
+    if (
+        dataset_url.head_describe is None
+        or dataset_url.head != origin_ref_info.head
+        or dataset_url.tags != tags
+    ):
+        dataset_url.head_describe = get_head_describe(ds)
 
-    dataset_url.tags = json.dumps(ds.repo.get_tags())
+    dataset_url.head = origin_ref_info.head
 
-    dataset_url.git_objects_kb = (
-        ds.repo.count_objects["size"] + ds.repo.count_objects["size-pack"]
-    )
+    dataset_url.branches = origin_ref_info.branches
+
+    dataset_url.tags = tags
+
+    # Note: `count_objects` is a property that runs `git count-objects` on each access
+    count_objects = ds.repo.count_objects
+    dataset_url.git_objects_kb = count_objects["size"] + count_objects["size-pack"]
 
     dataset_url.last_update_dt = datetime.now(timezone.utc)
 
 
 # Map of extractors to their respective required files
 #     The required files are specified relative to the root of the dataset
-_EXTRACTOR_REQUIRED_FILES = {
-    "metalad_core": [".datalad/config"],
-    "metalad_studyminimeta": [".studyminimeta.yaml"],
-    "datacite_gin": ["datacite.yml"],
-    "bids_dataset": ["dataset_description.json"],
+_EXTRACTOR_REQUIRED_FILES: dict[str, frozenset[str]] = {
+    "metalad_core": frozenset({".datalad/config"}),
+    "metalad_studyminimeta": frozenset({".studyminimeta.yaml"}),
+    "datacite_gin": frozenset({"datacite.yml"}),
+    "bids_dataset": frozenset({"dataset_description.json"}),
     # === DANDI related extractors ===
-    "dandi": ["dandiset.yaml"],
-    "dandi:files": [".dandi/assets.json"],
+    "dandi": frozenset({"dandiset.yaml"}),
+    "dandi:files": frozenset({".dandi/assets.json"}),
 }
 
 
@@ -138,8 +148,7 @@ def log_error(request, exc, traceback) -> None:
 
 # `acks_late` is set. Make sure this task is always idempotent
 @shared_task(acks_late=True)
-@validate_arguments
-def extract_ds_meta(ds_url_id: StrictInt, extractor: StrictStr) -> ExtractMetaStatus:
+def extract_ds_meta(ds_url_id: int, extractor: str) -> ExtractMetaStatus:
     """
     Extract dataset level metadata from a dataset
 
@@ -167,13 +176,7 @@ def extract_ds_meta(ds_url_id: StrictInt, extractor: StrictStr) -> ExtractMetaSt
     """
 
     # Get the RepoUrl from the database by ID with a read/share lock
-    url = (
-        db.session.execute(
-            select(RepoUrl).filter_by(id=ds_url_id).with_for_update(read=True)
-        )
-        .scalars()
-        .one_or_none()
-    )
+    url = db.session.get(RepoUrl, ds_url_id, with_for_update={"read": True})
 
     if url is None:
         # === there is no RepoUrl in the database with the specified ID ===
@@ -187,30 +190,40 @@ def extract_ds_meta(ds_url_id: StrictInt, extractor: StrictStr) -> ExtractMetaSt
     assert cache_path_abs is not None
 
     # Check for missing of required files
-    if extractor in _EXTRACTOR_REQUIRED_FILES:
-        for required_file_path in (
-            cache_path_abs / f for f in _EXTRACTOR_REQUIRED_FILES[extractor]
+    # Note: The required files are checked with `os.path.isfile()` directly on
+    #       the joined path strings, sparing the construction of a `Path` object
+    #       for each of them. Each check is a single `stat()` call. (A required file
+    #       can be nested in a subdirectory, so listing the top-level directory
+    #       of the dataset is not an option.)
+    if (required_files := _EXTRACTOR_REQUIRED_FILES.get(extractor)) is not None:
+        cache_path_abs_str = str(cache_path_abs)
+        if not all(
+            os.path.isfile(os.path.join(cache_path_abs_str, f)) for f in required_files
         ):
-            if not required_file_path.is_file():
-                # A required file is missing. Abort the extraction
-                return ExtractMetaStatus.ABORTED
+            # A required file is missing. Abort the extraction
+            return ExtractMetaStatus.ABORTED
 
     # Check if the metadata to be extracted is already present in the database
-    for data in url.metadata_:  # type: ignore
-        if extractor == data.extractor_name:
-            # Get the current version of the dataset as it exists in the local cache
-            ds_version = require_dataset(
-                cache_path_abs, check_installed=True
-            ).repo.get_hexsha()
-
-            if ds_version == data.dataset_version:
-                # The metadata to be extracted is already present in the database
-                return ExtractMetaStatus.SKIPPED
-            else:
-                # metadata can be extracted for a new version of the dataset
+    # Note: Only the metadata by the given extractor is looked up. The other metadata of
+    #       the dataset at the URL are not loaded.
+    data = (
+        db.session.execute(
+            select(URLMetadata).filter_by(url_id=url.id, extractor_name=extractor)
+        )
+        .scalars()
+        .first()
+    )
+    if data is not None:
+        # Get the current version of the dataset as it exists in the local cache
+        ds_version = get_head_hexsha(cache_path_abs)
+
+        if ds_version == data.dataset_version:
+            # The metadata to be extracted is already present in the database
+            return ExtractMetaStatus.SKIPPED
+        else:
+            # metadata can be extracted for a new version of the dataset
 
-                db.session.delete(data)  # delete the old metadata from the database
-                break
+            db.session.delete(data)  # delete the old metadata from the database
 
     if extractor in BUILTIN_EXTRACTOR_MAP:
         # === The extractor is a built-in extractor ===
@@ -231,33 +244,41 @@ def extract_ds_meta(ds_url_id: StrictInt, extractor: StrictStr) -> ExtractMetaSt
             purpose=f"{extractor} metadata extraction",
         )
 
-        results = parse_obj_as(
-            list[MetaExtractResult],
-            dl.meta_extract(
-                extractor,
-                dataset=ds,
-                result_renderer="disabled",
-                on_failure="stop",
-            ),
+        # Consume the results of the extraction as they are generated
+        # Note: The results are not validated through `MetaExtractResult`, which
+        #       would copy the, possibly large and deeply nested, extracted metadata.
+        #       They are accessed as the dictionaries, of the structure described by
+        #       `MetaExtractResult`, that they are, and the fields that are recorded
+        #       are checked by the column types of the database.
+        results = dl.meta_extract(
+            extractor,
+            dataset=ds,
+            result_renderer="disabled",
+            on_failure="stop",
+            return_type="generator",
         )
 
-        # Assert that `datalad.api.meta_extract()` returns a list of one element
-        # as we understand that `datalad.api.meta_extract()` is supposed to return
-        assert (
-            len(results) == 1
-        ), f"`datalad.api.meta_extract()` returned a list of {len(results)} elements."
+        res = next(results, None)
+        extra_result_count = sum(1 for _ in results)
 
-        res = results[0]
-        if res.status == "ok":
+        # Assert that `datalad.api.meta_extract()` generates one result
+        # as we understand that `datalad.api.meta_extract()` is supposed to generate
+        assert res is not None, "`datalad.api.meta_extract()` generated no result."
+        assert extra_result_count == 0, (
+            f"`datalad.api.meta_extract()` generated "
+            f"{extra_result_count + 1} results."
+        )
+
+        if (res_status := res["status"]) == "ok":
             # Record the metadata to the database
-            metadata_record = res.metadata_record
+            metadata_record = res["metadata_record"]
             url_metadata = URLMetadata(
                 dataset_describe=get_head_describe(ds),
-                dataset_version=metadata_record.dataset_version,
-                extractor_name=metadata_record.extractor_name,
-                extractor_version=metadata_record.extractor_version,
-                extraction_parameter=metadata_record.extraction_parameter,
-                extracted_metadata=metadata_record.extracted_metadata,
+                dataset_version=metadata_record["dataset_version"],
+                extractor_name=metadata_record["extractor_name"],
+                extractor_version=metadata_record["extractor_version"],
+                extraction_parameter=metadata_record["extraction_parameter"],
+                extracted_metadata=metadata_record["extracted_metadata"],
                 url=url,
             )
         else:
@@ -270,7 +291,7 @@ def extract_ds_meta(ds_url_id: StrictInt, extractor: StrictStr) -> ExtractMetaSt
 
             raise RuntimeError(
                 f"The returned execution status from {extractor} for "
-                f"{url.url} is {res.status}."
+                f"{url.url} is {res_status}."
             )
 
     # Record the metadata to the database
@@ -282,12 +303,17 @@ def extract_ds_meta(ds_url_id: StrictInt, extractor: StrictStr) -> ExtractMetaSt
 
 @shared_task(
     acks_late=True,  # `acks_late` is set. Make sure this task is always idempotent
+    # Retry upon failure in cloning the dataset with exponential backoff, starting at
+    # 100 seconds and capped at `retry_backoff_max`, with jitter applied to the delays
+    # so that retries of the processing of many URLs don't hit the hosts of
+    # the datasets at once
     autoretry_for=(IncompleteResultsError,),
     max_retries=4,
     retry_backoff=100,
+    retry_backoff_max=600,
+    retry_jitter=True,
 )
-@validate_arguments
-def process_dataset_url(dataset_url_id: StrictInt) -> ProcessUrlStatus:
+def process_dataset_url(dataset_url_id: int) -> ProcessUrlStatus:
     """
     Process a RepoUrl
 
@@ -312,13 +338,9 @@ def process_dataset_url(dataset_url_id: StrictInt) -> ProcessUrlStatus:
           of this task because the RepoUrl has been deleted from the database.)
     """
 
-    # Get the RepoUrl from the database by ID
-    dataset_url: Optional[RepoUrl] = (
-        db.session.execute(
-            select(RepoUrl).filter_by(id=dataset_url_id).with_for_update()
-        )
-        .scalars()
-        .one_or_none()
+    # Get the RepoUrl from the database by ID (primary key) with a lock
+    dataset_url: Optional[RepoUrl] = db.session.get(
+        RepoUrl, dataset_url_id, with_for_update=True
     )
 
     if dataset_url is None:
@@ -340,6 +362,12 @@ def process_dataset_url(dataset_url_id: StrictInt) -> ProcessUrlStatus:
 
     try:
         # Clone the dataset at the specified URL to the newly created directory
+        # Note: A full clone is needed. In a partial clone, e.g. one made with
+        #       `--filter=blob:none`, git-annex would fetch the blobs of
+        #       the git-annex branch one by one from the remote in collecting
+        #       the annex information of the dataset, the metadata extractors would
+        #       trigger fetches for the files they read, and `git_objects_kb` would
+        #       no longer reflect the size of the repository.
         ds = clone(
             source=dataset_url.url,
             path=ds_path_absolute,
@@ -371,8 +399,7 @@ def process_dataset_url(dataset_url_id: StrictInt) -> ProcessUrlStatus:
 
 
 @shared_task
-@validate_arguments
-def mark_for_chk(url_id: StrictInt) -> None:
+def mark_for_chk(url_id: int) -> None:
     """
     Mark a dataset url for check for update with a timestamp as the value of
     `chk_req_dt` of the `RepoUrl` object representing the URL
@@ -380,21 +407,22 @@ def mark_for_chk(url_id: StrictInt) -> None:
     :param url_id: The ID (primary key) of the `RepoUrl` object representing the URL
     """
 
-    # Select and lock the dataset url to be marked for update check
-    url: Optional[RepoUrl] = (
-        db.session.execute(select(RepoUrl).filter_by(id=url_id).with_for_update())
-        .scalars()
-        .one_or_none()
-    )
-
+    # Mark the dataset url in a single `UPDATE` statement, which locks the record
+    # of the url only if it is to be marked
     # Note: It is possible that there is no `RepoUrl` record with the given ID
-    #       (possibly due to deletion).
-    #       So do something only if there is such a record
-    if url is not None and url.processed and url.chk_req_dt is None:
-        # The dataset url has been processed and there is no unhandled request
-        # for check for update of the dataset at the URL
-        url.chk_req_dt = datetime.now(timezone.utc)
-        db.session.commit()
+    #       (possibly due to deletion). In that case, nothing is updated.
+    db.session.execute(
+        update(RepoUrl)
+        .where(
+            RepoUrl.id == url_id,
+            # The dataset url has been processed and there is no unhandled request
+            # for check for update of the dataset at the URL
+            RepoUrl.processed,
+            RepoUrl.chk_req_dt.is_(None),
+        )
+        .values(chk_req_dt=func.now())
+    )
+    db.session.commit()
 
 
 @shared_task
@@ -491,16 +519,19 @@ def url_chk_dispatcher() -> list[int]:
 
     db.session.rollback()  # Release the lock
 
-    urls_to_chk_by_id = []
-    for id_, last_chk_dt in result:
-        chk_url_to_update.apply_async(
-            (id_, last_chk_dt), expires=chk_url_task_expiration
-        )
-        urls_to_chk_by_id.append(id_)
+    if result:
+        # Send all the check tasks to the broker as a group, through a single
+        # producer, instead of one `apply_async()` call per task
+        group(
+            chk_url_to_update.s(id_, last_chk_dt) for id_, last_chk_dt in result
+        ).apply_async(expires=chk_url_task_expiration)
 
-    return urls_to_chk_by_id
+    return [id_ for id_, _ in result]
 
 
+# Note: `@validate_arguments` is needed here, unlike for the tasks that take only
+#       arguments of JSON native types, to restore the `datetime` argument from its
+#       JSON serialization by the "pydantic_json" serializer
 @shared_task
 @validate_arguments
 def chk_url_to_update(
@@ -521,13 +552,7 @@ def chk_url_to_update(
 
     # Select and lock the RepoUrl identified by the given ID if it is not locked
     # by another transaction
-    url = (
-        db.session.execute(
-            select(RepoUrl).filter_by(id=url_id).with_for_update(skip_locked=True)
-        )
-        .scalars()
-        .one_or_none()
-    )
+    url = db.session.get(RepoUrl, url_id, with_for_update={"skip_locked": True})
 
     if url is None:
         # ===
@@ -611,13 +636,16 @@ def chk_url_to_update(
             else:
                 is_record_updated = True
 
-                # Initiate extraction of metadata of the up-to-date dataset
-                for extractor in current_app.config[
-                    "DATALAD_REGISTRY_METADATA_EXTRACTORS"
-                ]:
-                    extract_ds_meta.apply_async(
+                # Initiate extraction of metadata of the up-to-date dataset,
+                # sending the extraction tasks to the broker as a group
+                group(
+                    extract_ds_meta.signature(
                         (url.id, extractor), link_error=log_error.s()
                     )
+                    for extractor in current_app.config[
+                        "DATALAD_REGISTRY_METADATA_EXTRACTORS"
+                    ]
+                ).apply_async()
 
         if is_new_clone:
             # Remove old clone
@@ -625,7 +653,7 @@ def chk_url_to_update(
 
             # Update the cache path in the record to the path of the new clone
             url.cache_path = str(
-                Path(ds_clone.path).relative_to(
+                ds_clone.pathobj.relative_to(
                     current_app.config["DATALAD_REGISTRY_DATASET_CACHE"]
                 )
             )
@@ -692,12 +720,19 @@ def usage_dashboard_sync() -> UsageDashboardSyncResult:
         if item.status is Status.active
     )
 
-    # Fetch repositories from database, the registered repositories
-    registered_repos = set(db.session.execute(select(RepoUrl.url)).scalars().all())
+    # Fetch the active repositories that are in the database, the registered
+    # active repositories, in a single query
+    # Note: Only the active repositories are looked up. The other registered
+    #       repositories are irrelevant here.
+    registered_active_repos = set(
+        db.session.execute(select(RepoUrl.url).filter(RepoUrl.url.in_(active_repos)))
+        .scalars()
+        .all()
+    )
 
     # Calculate the set of active repositories that exist in the usage dashboard
     # but not in the database, not registered
-    active_repos_to_register = active_repos - registered_repos
+    active_repos_to_register = active_repos - registered_active_repos
 
     # Submit (register) this set of repositories to Datalad-Registry through the web API
     with requests.Session() as session:
@@ -35,6 +35,8 @@ def allocate_ds_path() -> Path:
           component separators, e.g. `/` in *nix
     """
 
+    base_cache_path: Path = current_app.config["DATALAD_REGISTRY_DATASET_CACHE"]
+
     # The while loop with the checking of the existence of the generated path can be
     # deemed as excessive by some. However, having it further ensures the returned path
     # is really one that is uniquely allocated for the cloning of a particular dataset
@@ -43,7 +45,7 @@ def allocate_ds_path() -> Path:
         uuid = uuid4().hex
         path = Path(uuid[:3], uuid[3:6], uuid[6:])
 
-        if not (current_app.config["DATALAD_REGISTRY_DATASET_CACHE"] / path).is_dir():
+        if not (base_cache_path / path).is_dir():
             return path
 
 
@@ -46,19 +46,22 @@ def dlreg_dandi_meta_extract(url: RepoUrl) -> URLMetadata:
     name = "dandi"  # Name of this extractor
     version = "0.0.1"  # Version of this extractor
 
-    assert url.cache_path_abs is not None, (
+    # Absolute path of the dataset clone in cache
+    cache_path_abs = url.cache_path_abs
+
+    assert cache_path_abs is not None, (
         f"Encountered a RepoUrl with no cache path, "
         f"with a processed flag set to {url.processed}"
     )
 
-    with open(url.cache_path_abs / "dandiset.yaml", "rb") as f:
+    with open(cache_path_abs / "dandiset.yaml", "rb") as f:
         extracted_metadata = yaml_load(f, Loader=SafeLoader)
 
     if extracted_metadata is None:
         raise InvalidRequiredFileError("dandiset.yaml has no document.")
 
     ds = require_dataset(
-        url.cache_path_abs, check_installed=True, purpose="dandiset metadata extraction"
+        cache_path_abs, check_installed=True, purpose="dandiset metadata extraction"
     )
 
     return URLMetadata(
@@ -1,13 +1,17 @@
 from datetime import datetime, timezone
 import json
+import os
 from pathlib import Path
+from typing import Any
 
 from celery import Celery
 from datalad import api as dl
 from datalad.api import Dataset
 from datalad.utils import rmtree as rm_ds_tree
+from flask import Flask
 import pytest
 from pytest import TempPathFactory
+from sqlalchemy import create_engine, make_url, text
 from yaml import safe_dump
 
 from datalad_registry import create_app
@@ -19,10 +23,45 @@ from datalad_registry.utils.datalad_tls import clone
 from .tools import populate_with_dataset_urls
 
 
+def _get_xdist_worker_db_uri(db_uri: str, worker_id: str) -> str:
+    """
+    Get the URI of the database for a pytest-xdist worker, creating the database
+    if it doesn't exist yet
+
+    :param db_uri: The URI of the database of the test environment
+    :param worker_id: The ID of the worker, e.g. "gw0"
+    :return: The URI of the database for the worker. The database is on the same
+             server as the database of the test environment and is named after it
+             with the worker ID as a suffix.
+    """
+    url = make_url(db_uri)
+    worker_db_name = f"{url.database}_{worker_id}"
+
+    # `CREATE DATABASE` cannot be executed inside a transaction block
+    engine = create_engine(url, isolation_level="AUTOCOMMIT")
+    try:
+        with engine.connect() as conn:
+            if (
+                conn.execute(
+                    text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                    {"name": worker_db_name},
+                ).scalar()
+                is None
+            ):
+                conn.execute(text(f'CREATE DATABASE "{worker_db_name}"'))
+    finally:
+        engine.dispose()
+
+    return url.set(database=worker_db_name).render_as_string(hide_password=False)
+
+
 @pytest.fixture(scope="session")
 def set_test_env(tmp_path_factory):
     """
     Set up the test environment variables
+
+    Note: When the tests are run in parallel with pytest-xdist, each worker uses
+          a database of its own, for the tests reset the database.
     """
     instance_path = tmp_path_factory.mktemp("instance")
     cache_path = tmp_path_factory.mktemp("cache")
@@ -32,6 +71,16 @@ def set_test_env(tmp_path_factory):
         m.setenv("DATALAD_REGISTRY_INSTANCE_PATH", str(instance_path))
         m.setenv("DATALAD_REGISTRY_DATASET_CACHE", str(cache_path))
 
+        # Set by pytest-xdist in its workers
+        worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+        if worker_id is not None:
+            m.setenv(
+                "SQLALCHEMY_DATABASE_URI",
+                _get_xdist_worker_db_uri(
+                    os.environ["SQLALCHEMY_DATABASE_URI"], worker_id
+                ),
+            )
+
         yield
 
 
@@ -40,39 +89,67 @@ def _flask_app(set_test_env):  # noqa: U100 (Unused argument)
     """
     The fixture of the datalad registry flask app that exists throughout a test session.
 
-    Note: This fixture should only be used by `flask_app` fixture directly.
+    Note: This fixture should only be used by the `flask_app` fixture and the fixtures
+          that set up the app the same way, e.g. `class_scoped_std_ds_urls`, directly.
     """
 
     app = create_app()
+
+    # Create the tables of the database once for the test session. Only their rows
+    # are cleared for each test. (See `_set_up_flask_app`.)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
     return app
 
 
-@pytest.fixture
-def flask_app(_flask_app):
+def _set_up_flask_app(app: Flask) -> None:
     """
-    The fixture of the datalad_registry Flask app set up with the database of the test
-    environment
+    Set up a datalad_registry Flask app with the database of the test environment
+
+    :param app: The Flask app
+
+    Note: The database of the app is reset, and the instance folder of the app and the
+          base local cache for datasets are cleared
     """
 
-    # Reset the database
-    with _flask_app.app_context():
-        db.drop_all()
-        db.create_all()
+    # Reset the database by clearing all the tables and restarting the sequences
+    # of their IDs, which is much cheaper than dropping and recreating the tables
+    with app.app_context():
+        db.session.execute(
+            text(
+                f"TRUNCATE TABLE "
+                f"{', '.join(t.name for t in db.metadata.sorted_tables)} "
+                f"RESTART IDENTITY CASCADE"
+            )
+        )
+        db.session.commit()
 
     # Clear the instance folder of the Flask app and the base local cache for datasets
-    instance_path = Path(_flask_app.instance_path)
-    cache_path = _flask_app.config["DATALAD_REGISTRY_DATASET_CACHE"]
+    instance_path = Path(app.instance_path)
+    cache_path = app.config["DATALAD_REGISTRY_DATASET_CACHE"]
     for p in [instance_path, cache_path]:
         rm_ds_tree(p)
         p.mkdir()
 
-    celery_app: Celery = _flask_app.extensions["celery"]
+    celery_app: Celery = app.extensions["celery"]
 
     # Set the Celery app attached to this Flask app as the current app for this thread
     celery_app.set_current()
     # Set the Celery app attached to this Flask app as the default app for all threads
     celery_app.set_default()
 
+
+@pytest.fixture
+def flask_app(_flask_app):
+    """
+    The fixture of the datalad_registry Flask app set up with the database of the test
+    environment
+    """
+
+    _set_up_flask_app(_flask_app)
+
     return _flask_app
 
 
@@ -260,68 +337,105 @@ def populate_with_2_dataset_urls(flask_app):
         db.session.commit()
 
 
+# A list of standard (typical) dataset URLs, each expressed as a dictionary of
+# the values of the columns of a `RepoUrl` record
+#
+# Note: The list is constructed once at import. It is never to be modified, and
+#       inserting it into the database does not modify it.
+_STD_DS_URLS: tuple[dict[str, Any], ...] = (
+    dict(
+        url="https://www.example.com",
+        ds_id="2a0b7b7b-a984-4c4a-844c-be3132291d7b",
+        head_describe="1234",
+        annex_key_count=20,
+        annexed_files_in_wt_count=200,
+        annexed_files_in_wt_size=1000,
+        git_objects_kb=110,
+        last_update_dt=datetime(2008, 7, 18, 18, 34, 32, tzinfo=timezone.utc),
+        last_chk_dt=datetime(2008, 7, 18, 19, 34, 34, tzinfo=timezone.utc),
+        chk_req_dt=datetime(2008, 7, 18, 18, 34, 34, tzinfo=timezone.utc),
+        # n_failed_chks = 0,  # Allow `n_failed_chks` to default
+        processed=True,
+        cache_path="8c8/fff/e01f2142d88690d92144b00af0",
+    ),
+    dict(
+        url="http://www.datalad.org",
+        ds_id="2a0b7b7b-a984-4c4a-844c-be3132291d7c",
+        head_describe="1234",
+        annex_key_count=40,
+        annexed_files_in_wt_count=100,
+        annexed_files_in_wt_size=400,
+        git_objects_kb=1100,
+        last_update_dt=datetime(2009, 6, 18, 18, 34, 32, tzinfo=timezone.utc),
+        last_chk_dt=datetime(2009, 6, 18, 19, 34, 7, tzinfo=timezone.utc),
+        # chk_req_dt=None, # Commenting this out to allow `chk_req_dt` to default
+        n_failed_chks=2,
+        processed=True,
+        cache_path="72e/cd9/cc10534e2a9f551e32119e0e60",
+    ),
+    dict(
+        url="https://handbook.datalad.org",
+        ds_id="2a0b7b7b-a984-4c4a-844c-be3132291a7c",
+        head_describe="1234",
+        annex_key_count=90,
+        annexed_files_in_wt_count=490,
+        annexed_files_in_wt_size=1000_000,
+        git_objects_kb=4000,
+        last_update_dt=datetime(2004, 6, 18, 18, 34, 32, tzinfo=timezone.utc),
+        last_chk_dt=datetime(2004, 6, 18, 18, 33, 7, tzinfo=timezone.utc),
+        chk_req_dt=datetime(2004, 6, 19, 18, 34, 34, tzinfo=timezone.utc),
+        n_failed_chks=9,
+        processed=True,
+        cache_path="72e/4e5/4184da47e282c02ae7e568ba74",
+    ),
+    dict(
+        url="https://www.dandiarchive.org",
+        processed=False,
+        cache_path="a/b/c",
+    ),
+)
+
+
 @pytest.fixture
 def populate_with_std_ds_urls(flask_app) -> list[str]:
     """
-    Populate the `repo_url` table with a list of standard (typical) RepoUrl objects
+    Populate the `repo_url` table with a list of standard (typical) dataset URLs
 
     Returns: The list of URLs, expressed in `str`, that were added to the database
     """
 
-    urls = [
-        RepoUrl(
-            url="https://www.example.com",
-            ds_id="2a0b7b7b-a984-4c4a-844c-be3132291d7b",
-            head_describe="1234",
-            annex_key_count=20,
-            annexed_files_in_wt_count=200,
-            annexed_files_in_wt_size=1000,
-            git_objects_kb=110,
-            last_update_dt=datetime(2008, 7, 18, 18, 34, 32, tzinfo=timezone.utc),
-            last_chk_dt=datetime(2008, 7, 18, 19, 34, 34, tzinfo=timezone.utc),
-            chk_req_dt=datetime(2008, 7, 18, 18, 34, 34, tzinfo=timezone.utc),
-            # n_failed_chks = 0,  # Allow `n_failed_chks` to default
-            processed=True,
-            cache_path="8c8/fff/e01f2142d88690d92144b00af0",
-        ),
-        RepoUrl(
-            url="http://www.datalad.org",
-            ds_id="2a0b7b7b-a984-4c4a-844c-be3132291d7c",
-            head_describe="1234",
-            annex_key_count=40,
-            annexed_files_in_wt_count=100,
-            annexed_files_in_wt_size=400,
-            git_objects_kb=1100,
-            last_update_dt=datetime(2009, 6, 18, 18, 34, 32, tzinfo=timezone.utc),
-            last_chk_dt=datetime(2009, 6, 18, 19, 34, 7, tzinfo=timezone.utc),
-            # chk_req_dt=None, # Commenting this out to allow `chk_req_dt` to default
-            n_failed_chks=2,
-            processed=True,
-            cache_path="72e/cd9/cc10534e2a9f551e32119e0e60",
-        ),
-        RepoUrl(
-            url="https://handbook.datalad.org",
-            ds_id="2a0b7b7b-a984-4c4a-844c-be3132291a7c",
-            head_describe="1234",
-            annex_key_count=90,
-            annexed_files_in_wt_count=490,
-            annexed_files_in_wt_size=1000_000,
-            git_objects_kb=4000,
-            last_update_dt=datetime(2004, 6, 18, 18, 34, 32, tzinfo=timezone.utc),
-            last_chk_dt=datetime(2004, 6, 18, 18, 33, 7, tzinfo=timezone.utc),
-            chk_req_dt=datetime(2004, 6, 19, 18, 34, 34, tzinfo=timezone.utc),
-            n_failed_chks=9,
-            processed=True,
-            cache_path="72e/4e5/4184da47e282c02ae7e568ba74",
-        ),
-        RepoUrl(
-            url="https://www.dandiarchive.org",
-            processed=False,
-            cache_path="a/b/c",
-        ),
-    ]
+    return populate_with_dataset_urls(list(_STD_DS_URLS), flask_app)
+
 
-    return populate_with_dataset_urls(urls, flask_app)
+@pytest.fixture(scope="class")
+def class_scoped_std_ds_urls(_flask_app) -> list[str]:
+    """
+    Set up the Flask app as the `flask_app` fixture does and populate the `repo_url`
+    table with the list of standard dataset URLs of `populate_with_std_ds_urls`,
+    once for all the tests in a test class
+
+    Returns: The list of URLs, expressed in `str`, that were added to the database
+
+    Note: This fixture is for test classes of which the tests only read from
+          the database. The tests share the database populated once instead of having
+          it reset and repopulated for each of them. Such a test class must not use
+          any fixture that resets the database, e.g. `flask_app`.
+    """
+
+    _set_up_flask_app(_flask_app)
+
+    return populate_with_dataset_urls(list(_STD_DS_URLS), _flask_app)
+
+
+@pytest.fixture
+def std_ds_urls_flask_client(
+    _flask_app, class_scoped_std_ds_urls  # noqa: U100 (unused argument)
+):
+    """
+    The fixture of the test client of the Flask app with the database populated by
+    `class_scoped_std_ds_urls`
+    """
+    return _flask_app.test_client()
 
 
 @pytest.fixture
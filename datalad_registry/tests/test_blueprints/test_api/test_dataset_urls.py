@@ -1,7 +1,14 @@
-from typing import Optional
+from typing import Any, Callable, Optional
 
+from flask.testing import FlaskClient
+from jsonschema import Draft7Validator
+from psycopg2.errors import UniqueViolation
 import pytest
 from pytest_mock import MockerFixture
+from sqlalchemy import event, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from werkzeug.test import TestResponse
 from yarl import URL as YURL
 
 from datalad_registry.blueprints.api.dataset_urls import DatasetURLRespModel
@@ -20,110 +27,263 @@ from datalad_registry.blueprints.api.url_metadata.models import (
     URLMetadataRef,
 )
 from datalad_registry.conf import OperationMode
-from datalad_registry.models import RepoUrl
-from datalad_registry.tests.tools import populate_with_dataset_urls
+from datalad_registry.models import RepoUrl, URLMetadata, db
+from datalad_registry.tests.tools import populate_with_dataset_urls, swap_attr
+
+# The path of the endpoint of dataset URLs
+_DATASET_URLS_PATH = "/api/v2/dataset-urls"
+
+# Validator of the response body representing a single dataset URL. The response
+# bodies of the tests that only need to ensure their shape are checked against
+# the JSON schema of `DatasetURLRespModel`, compiled once, instead of being parsed
+# into the model.
+_DATASET_URL_RESP_VALIDATOR = Draft7Validator(DatasetURLRespModel.schema())
+
+# The URLs, and the cache path of one of them, of the standard dataset URLs
+# (See the `populate_with_std_ds_urls` fixture.)
+_EXAMPLE_URL = "https://www.example.com"
+_DATALAD_URL = "http://www.datalad.org"
+_HANDBOOK_URL = "https://handbook.datalad.org"
+_DANDI_URL = "https://www.dandiarchive.org"
+_EXAMPLE_CACHE_PATH = "8c8/fff/e01f2142d88690d92144b00af0"
+
+# Request bodies that are invalid for declaring a dataset URL
+_INVALID_REQUEST_JSON_BODIES = (
+    {},
+    {"abc": "https://example.com"},
+    {"url": ""},
+    {"url": "hehe"},
+    {"url": "haha/hehe"},
+    {"url": "www.example.com"},
+)
+
+# Query parameters that are valid for getting dataset URLs
+_VALID_QUERY_PARAMS = (
+    {"url": "https://www.example.com"},
+    {"ds_id": "2a0b7b7b-a984-4c4a-844c-be3132291d7b"},
+    {"min_annex_key_count": "1"},
+    {"max_annex_key_count": 2},
+    {"min_annexed_files_in_wt_count": 200},
+    {"max_annexed_files_in_wt_count": "40"},
+    {"min_annexed_files_in_wt_size": 33},
+    {"max_annexed_files_in_wt_size": 21},
+    {"earliest_last_update": 656409661000},
+    {"latest_last_update": "2001-03-22T01:22:34"},
+    {"min_git_objects_kb": 40},
+    {"max_git_objects_kb": "100"},
+    {"processed": True},
+    {"return_metadata": None},
+    {"return_metadata": MetadataReturnOption.reference.value},
+    {"return_metadata": MetadataReturnOption.content.value},
+    {"page": 1},
+    {"per_page": 10},
+    {"per_page": 100},
+    {"order_by": "url"},
+    {"order_by": "annex_key_count"},
+    {"order_by": "annexed_files_in_wt_count"},
+    {"order_by": "annexed_files_in_wt_size"},
+    {"order_by": "last_update_dt"},
+    {"order_by": "git_objects_kb"},
+    {"order_dir": "asc"},
+    {"order_dir": "desc"},
+    {"min_annexed_files_in_wt_size": 33, "search": "   a b c "},
+    {"min_annexed_files_in_wt_size": 33, "search": "   a \t b \n c "},
+    {"min_annexed_files_in_wt_size": 33, "search": "a"},
+)
+
+# Query parameters that are invalid for getting dataset URLs
+_INVALID_QUERY_PARAMS = (
+    {"url": "www.example.com"},
+    {"ds_id": "34"},
+    {"min_annex_key_count": "ab"},
+    {"max_annex_key_count": "bc"},
+    {"min_annexed_files_in_wt_count": "cd"},
+    {"max_annexed_files_in_wt_count": "def"},
+    {"min_annexed_files_in_wt_size": "efg"},
+    {"max_annexed_files_in_wt_size": "hij"},
+    {"earliest_last_update": "jkl"},
+    {"latest_last_update": "klm"},
+    {"min_git_objects_kb": "lmn"},
+    {"max_git_objects_kb": "mno"},
+    {"processed": "nop"},
+    {"return_metadata": "all"},
+    {"page": 0},
+    {"page": -1},
+    {"page": -100},
+    {"page": "a"},
+    {"per_page": 0},
+    {"per_page": -1},
+    {"per_page": -100},
+    {"per_page": "b"},
+    {"order_by": "abc"},
+    {"order_dir": "def"},
+    {"search": ""},
+    {"search": "    "},
+    {"search": "   \t \n"},
+    {"search": "\n"},
+    {"search": "\t  "},
+    {"max_annex_key_count": 2, "search": ""},
+    {"max_annex_key_count": 2, "search": "    "},
+    {"max_annex_key_count": 2, "search": "  \t  "},
+    {"max_annex_key_count": 2, "search": "  \t  \n  "},
+)
+
+
+def _get_pg(flask_client: FlaskClient, pg_lk: str) -> TestResponse:
+    """
+    Get a page of dataset URLs through a link to it
+
+    :param flask_client: The test client of the Flask app
+    :param pg_lk: The link to the page, an absolute URL as provided in a page of
+                  dataset URLs
+    :return: The response
+
+    Note: The link is split into its path and its query string before being passed to
+          the test client, sparing the test client the handling of an absolute URL.
+    """
+    pg_url = YURL(pg_lk)
+    return flask_client.get(pg_url.path, query_string=pg_url.raw_query_string)
+
+
+def _check_pg_lks(pg_lks: list[tuple[Optional[str], str]]) -> None:
+    """
+    Check the links to pages of dataset URLs in the responses in `test_pagination`
+
+    :param pg_lks: The links, each paired with the expected page number in `str`
+    """
+    for pg_lk, expected_pg in pg_lks:
+        assert pg_lk is not None
+
+        # Parse each link only once and check its query through a single reference
+        pg_url = YURL(pg_lk)
+        pg_query = pg_url.query
+
+        assert pg_url.path == _DATASET_URLS_PATH
+
+        assert len(pg_query) == 4
+        assert pg_query["page"] == expected_pg
+        assert pg_query["per_page"] == "2"
+        assert pg_query["order_by"] == "last_update_dt"
+        assert pg_query["order_dir"] == "desc"
+
+
+@pytest.fixture
+def raise_at_commit():
+    """
+    Fixture providing a function that makes every commit of any SQLAlchemy ORM session
+    raise an exception, obtained from a given function, for the rest of a test
+
+    The given function is called with the session being committed and returns
+    the exception to raise. The exception is raised by a listener of
+    the "before_commit" event of `Session`, and the listeners are removed at
+    the teardown of this fixture, without patching any attribute of
+    the sessions or their classes.
+    """
+    listeners = []
+
+    def _raise_at_commit(get_exc: Callable[[Session], Exception]) -> None:
+        def before_commit(session: Session) -> None:
+            raise get_exc(session)
+
+        event.listen(Session, "before_commit", before_commit)
+        listeners.append(before_commit)
+
+    yield _raise_at_commit
+
+    for listener in listeners:
+        event.remove(Session, "before_commit", listener)
 
 
 class TestDeclareDatasetURL:
+    @pytest.fixture(autouse=True)
+    def mark_for_chk_delay_mock(self, mocker: MockerFixture):
+        """
+        Keep every test in this class from sending a `mark_for_chk` task to the broker
+
+        :return: The mock replacing the `delay` method of the `mark_for_chk` task
+        """
+        from datalad_registry.blueprints.api.dataset_urls import mark_for_chk
+
+        return mocker.patch.object(mark_for_chk, "delay")
+
     def test_without_body(self, flask_client):
-        resp = flask_client.post("/api/v2/dataset-urls")
+        resp = flask_client.post(_DATASET_URLS_PATH)
         assert resp.status_code == 422
 
-    @pytest.mark.parametrize(
-        "request_json_body",
-        [
-            {},
-            {"abc": "https://example.com"},
-            {"url": ""},
-            {"url": "hehe"},
-            {"url": "haha/hehe"},
-            {"url": "www.example.com"},
-        ],
-    )
-    def test_invalid_body(self, flask_client, request_json_body):
-        resp = flask_client.post("/api/v2/dataset-urls", json=request_json_body)
-        assert resp.status_code == 422
+    def test_invalid_body(self, flask_client):
+        # The invalid bodies are tried in a single test, with a single setup of the app
+        # and the database, for only the status code of each response is checked.
+        # The bodies that are not rejected are reported together.
+        unrejected_bodies = []
+        for request_json_body in _INVALID_REQUEST_JSON_BODIES:
+            resp = flask_client.post(_DATASET_URLS_PATH, json=request_json_body)
+            if resp.status_code != 422:
+                unrejected_bodies.append(request_json_body)
+
+        assert unrejected_bodies == []
 
     @pytest.mark.parametrize(
         "request_json_body",
         [{"url": "https://example.com"}, {"url": "/hehe"}, {"url": "/haha/hehe"}],
     )
     def test_valid_body(self, flask_client, request_json_body):
-        resp = flask_client.post("/api/v2/dataset-urls", json=request_json_body)
+        resp = flask_client.post(_DATASET_URLS_PATH, json=request_json_body)
         assert resp.status_code == 201
 
         # Ensure the response body is valid
-        DatasetURLRespModel.parse_raw(resp.text)
+        _DATASET_URL_RESP_VALIDATOR.validate(resp.json)
 
-    def test_retrieve_blocking_record(self, flask_client, monkeypatch):
+    def test_retrieve_blocking_record(self, flask_client, raise_at_commit):
         """
         Test the case that a submitted URL cannot be inserted into the database
         because there is a blocking record in the database.
         """
-        from psycopg2.errors import UniqueViolation
-        from sqlalchemy.exc import IntegrityError
-        from sqlalchemy.orm.scoping import scoped_session
-
-        from datalad_registry.models import RepoUrl
-
-        def mock_commit(_scoped_session_obj):
-            raise IntegrityError(None, None, UniqueViolation(None, None, None))
-
-        def mock_rollback(scoped_session_obj):
-            original_rollback(scoped_session_obj)
+        url_as_str = "https://www.example.com"
 
-            # Insure a `RepoUrl` record with the given URL
-            scoped_session_obj.add(RepoUrl(url=url_as_str))
-            original_commit(scoped_session_obj)
+        def get_exc(_session: Session) -> Exception:
+            # Insert a blocking record, as another request would, through a connection
+            # other than the one of the session
+            with db.engine.begin() as conn:
+                conn.execute(insert(RepoUrl).values(url=url_as_str))
 
-        original_commit = scoped_session.commit
-        original_rollback = scoped_session.rollback
-        url_as_str = "https://www.example.com"
+            return IntegrityError(None, None, UniqueViolation(None, None, None))
 
-        monkeypatch.setattr(scoped_session, "commit", mock_commit)
-        monkeypatch.setattr(scoped_session, "rollback", mock_rollback)
+        raise_at_commit(get_exc)
 
-        resp = flask_client.post("/api/v2/dataset-urls", json={"url": url_as_str})
+        resp = flask_client.post(_DATASET_URLS_PATH, json={"url": url_as_str})
 
         assert resp.status_code == 201
 
-    def test_failure_to_insert_url_to_db(self, flask_client, monkeypatch):
+    def test_failure_to_insert_url_to_db(self, flask_client, raise_at_commit):
         """
         Test the case that a submitted URL cannot be inserted into the database
         because concurrent requests and processes repeatedly insert and delete
         `RepoUrl` objects presenting the same URL.
         """
-        from psycopg2.errors import UniqueViolation
-        from sqlalchemy.exc import IntegrityError
-        from sqlalchemy.orm.scoping import scoped_session
-
-        def mock_commit(_scoped_session_obj):
-            raise IntegrityError(None, None, UniqueViolation(None, None, None))
-
-        monkeypatch.setattr(scoped_session, "commit", mock_commit)
+        raise_at_commit(
+            lambda _session: IntegrityError(
+                None, None, UniqueViolation(None, None, None)
+            )
+        )
 
         with pytest.raises(RuntimeError, match="Failed to add the URL"):
             flask_client.post(
-                "/api/v2/dataset-urls", json={"url": "https://www.example.com"}
+                _DATASET_URLS_PATH, json={"url": "https://www.example.com"}
             )
 
-    def test_other_integrity_error(self, flask_client, monkeypatch):
+    def test_other_integrity_error(self, flask_client, raise_at_commit):
         """
         Test the case that a submitted URL cannot be inserted into the database
         because of an integrity error that is not caused directly by
         a `UniqueViolation` error.
         """
-        from sqlalchemy.exc import IntegrityError
-        from sqlalchemy.orm.scoping import scoped_session
-
-        def mock_commit(_scoped_session_obj):
-            raise IntegrityError("This is a test", None, ValueError())
-
-        monkeypatch.setattr(scoped_session, "commit", mock_commit)
+        raise_at_commit(
+            lambda _session: IntegrityError("This is a test", None, ValueError())
+        )
 
         with pytest.raises(IntegrityError, match="This is a test"):
             flask_client.post(
-                "/api/v2/dataset-urls", json={"url": "https://www.example.com"}
+                _DATASET_URLS_PATH, json={"url": "https://www.example.com"}
             )
 
     @pytest.mark.usefixtures("populate_with_std_ds_urls")
@@ -141,21 +301,17 @@ class TestDeclareDatasetURL:
         url,
         expected_mark_for_chk_delay_args,
         flask_client,
-        mocker: MockerFixture,
+        mark_for_chk_delay_mock,
     ):
         """
         Test resubmitting URLs that already exist in the database
         """
 
-        from datalad_registry.blueprints.api.dataset_urls import mark_for_chk
-
-        mark_for_chk_delay_mock = mocker.patch.object(mark_for_chk, "delay")
-
-        resp = flask_client.post("/api/v2/dataset-urls", json={"url": url})
+        resp = flask_client.post(_DATASET_URLS_PATH, json={"url": url})
         assert resp.status_code == 202
 
         # Ensure the response body is valid
-        DatasetURLRespModel.parse_raw(resp.text)
+        _DATASET_URL_RESP_VALIDATOR.validate(resp.json)
 
         if expected_mark_for_chk_delay_args is None:
             mark_for_chk_delay_mock.assert_not_called()
@@ -174,267 +330,38 @@ class TestDeclareDatasetURL:
         )
 
         resp = flask_client.post(
-            "/api/v2/dataset-urls", json={"url": "https://www.example.com"}
+            _DATASET_URLS_PATH, json={"url": "https://www.example.com"}
         )
         assert resp.status_code == 405
         assert set(resp.headers["Allow"].split(", ")) == {"GET", "HEAD", "OPTIONS"}
 
 
 class TestDatasetURLs:
-    @pytest.mark.parametrize(
-        "query_params",
-        [
-            {"url": "www.example.com"},
-            {"ds_id": "34"},
-            {"min_annex_key_count": "ab"},
-            {"max_annex_key_count": "bc"},
-            {"min_annexed_files_in_wt_count": "cd"},
-            {"max_annexed_files_in_wt_count": "def"},
-            {"min_annexed_files_in_wt_size": "efg"},
-            {"max_annexed_files_in_wt_size": "hij"},
-            {"earliest_last_update": "jkl"},
-            {"latest_last_update": "klm"},
-            {"min_git_objects_kb": "lmn"},
-            {"max_git_objects_kb": "mno"},
-            {"processed": "nop"},
-            {"return_metadata": "all"},
-            {"page": 0},
-            {"page": -1},
-            {"page": -100},
-            {"page": "a"},
-            {"per_page": 0},
-            {"per_page": -1},
-            {"per_page": -100},
-            {"per_page": "b"},
-            {"order_by": "abc"},
-            {"order_dir": "def"},
-            {"search": ""},
-            {"search": "    "},
-            {"search": "   \t \n"},
-            {"search": "\n"},
-            {"search": "\t  "},
-            {"max_annex_key_count": 2, "search": ""},
-            {"max_annex_key_count": 2, "search": "    "},
-            {"max_annex_key_count": 2, "search": "  \t  "},
-            {"max_annex_key_count": 2, "search": "  \t  \n  "},
-        ],
-    )
-    def test_invalid_query_params(self, flask_client, query_params):
-        resp = flask_client.get("/api/v2/dataset-urls", query_string=query_params)
-        assert resp.status_code == 422
-
-    @pytest.mark.parametrize(
-        "query_params",
-        [
-            {"url": "https://www.example.com"},
-            {"ds_id": "2a0b7b7b-a984-4c4a-844c-be3132291d7b"},
-            {"min_annex_key_count": "1"},
-            {"max_annex_key_count": 2},
-            {"min_annexed_files_in_wt_count": 200},
-            {"max_annexed_files_in_wt_count": "40"},
-            {"min_annexed_files_in_wt_size": 33},
-            {"max_annexed_files_in_wt_size": 21},
-            {"earliest_last_update": 656409661000},
-            {"latest_last_update": "2001-03-22T01:22:34"},
-            {"min_git_objects_kb": 40},
-            {"max_git_objects_kb": "100"},
-            {"processed": True},
-            {"return_metadata": None},
-            {"return_metadata": MetadataReturnOption.reference.value},
-            {"return_metadata": MetadataReturnOption.content.value},
-            {"page": 1},
-            {"per_page": 10},
-            {"per_page": 100},
-            {"order_by": "url"},
-            {"order_by": "annex_key_count"},
-            {"order_by": "annexed_files_in_wt_count"},
-            {"order_by": "annexed_files_in_wt_size"},
-            {"order_by": "last_update_dt"},
-            {"order_by": "git_objects_kb"},
-            {"order_dir": "asc"},
-            {"order_dir": "desc"},
-            {"min_annexed_files_in_wt_size": 33, "search": "   a b c "},
-            {"min_annexed_files_in_wt_size": 33, "search": "   a \t b \n c "},
-            {"min_annexed_files_in_wt_size": 33, "search": "a"},
-        ],
-    )
-    def test_valid_query_params(self, flask_client, query_params):
-        resp = flask_client.get("/api/v2/dataset-urls", query_string=query_params)
-        assert resp.status_code == 200
-
-    @pytest.mark.usefixtures("populate_with_std_ds_urls")
-    @pytest.mark.parametrize(
-        "query_params, expected_output",
-        [
-            (
-                {},
-                {
-                    "https://www.example.com",
-                    "http://www.datalad.org",
-                    "https://handbook.datalad.org",
-                    "https://www.dandiarchive.org",
-                },
-            ),
-            ({"url": "https://www.example.com"}, {"https://www.example.com"}),
-            (
-                {"ds_id": "2a0b7b7b-a984-4c4a-844c-be3132291d7c"},
-                {"http://www.datalad.org"},
-            ),
-            (
-                {"min_annex_key_count": "39"},
-                {"http://www.datalad.org", "https://handbook.datalad.org"},
-            ),
-            (
-                {"min_annex_key_count": "39", "max_annex_key_count": 40},
-                {"http://www.datalad.org"},
-            ),
-            (
-                {
-                    "min_annexed_files_in_wt_count": 190,
-                    "max_annexed_files_in_wt_count": 500,
-                },
-                {"https://www.example.com", "https://handbook.datalad.org"},
-            ),
-            ({"min_annexed_files_in_wt_size": 1000_001}, set()),
-            ({"max_annexed_files_in_wt_size": 500}, {"http://www.datalad.org"}),
-            (
-                {"max_annexed_files_in_wt_size": 2000},
-                {"https://www.example.com", "http://www.datalad.org"},
-            ),
-            (
-                {
-                    "min_annexed_files_in_wt_size": 300,
-                    "max_annexed_files_in_wt_size": 2200,
-                },
-                {"https://www.example.com", "http://www.datalad.org"},
-            ),
-            (
-                {"earliest_last_update": "2001-03-22T01:22:34"},
-                {
-                    "https://www.example.com",
-                    "http://www.datalad.org",
-                    "https://handbook.datalad.org",
-                },
-            ),
-            (
-                {
-                    "earliest_last_update": "2007-03-22T01:22:34",
-                    "latest_last_update": "2009-03-22T01:22:34",
-                },
-                {"https://www.example.com"},
-            ),
-            (
-                {"min_git_objects_kb": 1000, "max_git_objects_kb": 2000},
-                {"http://www.datalad.org"},
-            ),
-            (
-                {"processed": True},
-                {
-                    "https://www.example.com",
-                    "http://www.datalad.org",
-                    "https://handbook.datalad.org",
-                },
-            ),
-            ({"processed": False}, {"https://www.dandiarchive.org"}),
-            (
-                {"min_annex_key_count": "39", "max_annexed_files_in_wt_size": 2200},
-                {"http://www.datalad.org"},
-            ),
-            # === filtered by cache_path ===
-            (
-                {"cache_path": "8c8/fff/e01f2142d88690d92144b00af0"},
-                {"https://www.example.com"},
-            ),
-            (
-                {"cache_path": "8c8/fff/e01f2142d88690d92144b00af0/"},
-                {"https://www.example.com"},
-            ),
-            (
-                {"cache_path": "8c8/fff/e01f2142d88690d92144b00af0//"},
-                {"https://www.example.com"},
-            ),
-            (
-                {"cache_path": "/a/c/8c8/fff/e01f2142d88690d92144b00af0"},
-                {"https://www.example.com"},
-            ),
-            (
-                {"cache_path": "/8c8/fff/e01f2142d88690d92144b00af0"},
-                {"https://www.example.com"},
-            ),
-            (
-                {"cache_path": "a/c/8c8/fff/e01f2142d88690d92144b00af0"},
-                set(),
-            ),
-            (
-                {"cache_path": "72e/4e5/4184da47e282c02ae7e568ba74"},
-                {"https://handbook.datalad.org"},
-            ),
-            (
-                {"cache_path": "a/b/c"},
-                {"https://www.dandiarchive.org"},
-            ),
-            # === filtered by search ===
-            (
-                {"search": "Handbook"},
-                {"https://handbook.datalad.org"},
-            ),
-            (
-                {"search": "ds_id:be3132291d7b"},
-                {"https://www.example.com"},
-            ),
-            (
-                {"search": "ds_id:be3132291d7c OR dandiarchive"},
-                {"http://www.datalad.org", "https://www.dandiarchive.org"},
-            ),
-            # === filtered by search and other query params ===
-            (
-                {"search": "ds_id:2a0b7b7b", "min_annex_key_count": "39"},
-                {"http://www.datalad.org", "https://handbook.datalad.org"},
-            ),
-            (
-                {"search": "url:.org", "max_annexed_files_in_wt_size": 401},
-                {"http://www.datalad.org"},
-            ),
-        ],
-    )
-    def test_filter(self, flask_client, query_params, expected_output):
-        expected_out_count = len(expected_output)
-
-        resp = flask_client.get("/api/v2/dataset-urls", query_string=query_params)
-        assert resp.status_code == 200
-
-        ds_url_page = DatasetURLPage.parse_raw(resp.text)
-
-        assert ds_url_page.cur_pg_num == DEFAULT_PAGE
-        assert ds_url_page.prev_pg is None
-        assert ds_url_page.next_pg is None
-        assert YURL(ds_url_page.first_pg).query["page"] == "1"
-        assert YURL(ds_url_page.last_pg).query["page"] == "1"
-        assert ds_url_page.collection_stats.summary.ds_count == expected_out_count
-
-        # Check the collection of dataset URLs
-        assert {i.url for i in ds_url_page.dataset_urls} == expected_output
-
-    @pytest.mark.usefixtures("populate_with_std_ds_urls")
-    @pytest.mark.parametrize(
-        "query_params",
-        [
-            {"search": "unknown_field:example"},
-            {"search": "url:example OR no_body:knows"},
-            {"url": "https://www.example.com", "search": "never:encountered"},
-        ],
-    )
-    def test_filter_with_invalid_search_query_param(self, query_params, flask_client):
-        """
-        Test filtering with a search query parameter with invalid grammar/syntax
-        """
-        resp = flask_client.get("/api/v2/dataset-urls", query_string=query_params)
-        assert resp.status_code == 400
-        assert "Grammar" in resp.json["description"]
-
-    def test_filter_with_invalid_search_query_param_with_mock(
-        self, monkeypatch, flask_client
-    ):
+    def test_invalid_query_params(self, flask_client):
+        # The invalid query parameters are tried in a single test, with a single setup
+        # of the app and the database, for only the status code of each response is
+        # checked. The query parameters that are not rejected are reported together.
+        unrejected_query_params = []
+        for query_params in _INVALID_QUERY_PARAMS:
+            resp = flask_client.get(_DATASET_URLS_PATH, query_string=query_params)
+            if resp.status_code != 422:
+                unrejected_query_params.append(query_params)
+
+        assert unrejected_query_params == []
+
+    def test_valid_query_params(self, flask_client):
+        # The valid query parameters are tried in a single test, with a single setup
+        # of the app and the database, for only the status code of each response is
+        # checked. The query parameters that are not accepted are reported together.
+        unaccepted_query_params = []
+        for query_params in _VALID_QUERY_PARAMS:
+            resp = flask_client.get(_DATASET_URLS_PATH, query_string=query_params)
+            if resp.status_code != 200:
+                unaccepted_query_params.append(query_params)
+
+        assert unaccepted_query_params == []
+
+    def test_filter_with_invalid_search_query_param_with_mock(self, flask_client):
         """
         Test handling of the situation where the search query parameter given to the
         endpoint causes a `lark.exceptions.UnexpectedInput` to be raised.
@@ -446,9 +373,9 @@ class TestDatasetURLs:
         def mock_parse_query(_query):
             raise UnexpectedInput("Mock UnexpectedInput")
 
-        monkeypatch.setattr(dataset_urls, "parse_query", mock_parse_query)
+        with swap_attr(dataset_urls, "parse_query", mock_parse_query):
+            resp = flask_client.get(_DATASET_URLS_PATH, query_string={"search": "foo"})
 
-        resp = flask_client.get("/api/v2/dataset-urls", query_string={"search": "foo"})
         assert resp.status_code == 400
         assert resp.json["description"] == "Invalid search string: Mock UnexpectedInput"
 
@@ -470,7 +397,7 @@ class TestDatasetURLs:
         else:
             query_string = {"return_metadata": metadata_ret_opt.value}
 
-        resp = flask_client.get("/api/v2/dataset-urls", query_string=query_string)
+        resp = flask_client.get(_DATASET_URLS_PATH, query_string=query_string)
 
         assert resp.status_code == 200
 
@@ -501,189 +428,59 @@ class TestDatasetURLs:
 
                 assert all(type(m) is metadata_ret_type for m in url.metadata)
 
-    def test_pagination(self, populate_with_std_ds_urls, flask_client):
+    @pytest.mark.usefixtures("populate_with_std_ds_urls")
+    @pytest.mark.parametrize(
+        "metadata_ret_opt",
+        [
+            None,
+            MetadataReturnOption.reference,
+            MetadataReturnOption.content,
+        ],
+    )
+    def test_no_null_fields(self, metadata_ret_opt, flask_app, flask_client):
         """
-        Test the pagination of the results
+        Test that fields with null values are absent from the dataset URLs returned,
+        including the metadata returned with them, as in the response of getting
+        a single dataset URL
         """
+        with flask_app.app_context():
+            db.session.add(
+                URLMetadata(
+                    dataset_describe="1234",
+                    dataset_version="1.0.0",
+                    extractor_name="metalad_core",
+                    extractor_version="0.14.0",
+                    extraction_parameter=dict(a=1, b=2),
+                    extracted_metadata=None,
+                    url_id=1,
+                )
+            )
+            db.session.commit()
 
-        # For storing all URLs obtained from all pages
-        ds_urls: set[str] = set()
-
-        # Get the first page
-        resp = flask_client.get("/api/v2/dataset-urls", query_string={"per_page": 2})
-
-        assert resp.status_code == 200
-
-        resp_json = resp.json
-        ds_url_pg = DatasetURLPage.parse_obj(resp_json)
-
-        assert ds_url_pg.cur_pg_num == 1
-        assert "prev_pg" not in resp_json
-        assert ds_url_pg.prev_pg is None
-        assert ds_url_pg.next_pg is not None
-        assert ds_url_pg.collection_stats.summary.ds_count == 4
-
-        next_pg_lk, first_pg_lk, last_pg_lk = (
-            YURL(pg)
-            for pg in (ds_url_pg.next_pg, ds_url_pg.first_pg, ds_url_pg.last_pg)
-        )
-
-        # Check page links
-        assert next_pg_lk.query["page"] == "2"
-        # noinspection DuplicatedCode
-        assert first_pg_lk.query["page"] == "1"
-        assert last_pg_lk.query["page"] == "2"
-        for pg_lk in (next_pg_lk, first_pg_lk, last_pg_lk):
-            assert pg_lk.path == "/api/v2/dataset-urls"
-
-            assert len(pg_lk.query) == 4
-            assert pg_lk.query["per_page"] == "2"
-            assert pg_lk.query["order_by"] == "last_update_dt"
-            assert pg_lk.query["order_dir"] == "desc"
-
-        assert len(ds_url_pg.dataset_urls) == 2
-
-        # Gather Dataset URLs from the first page
-        for url in ds_url_pg.dataset_urls:
-            ds_urls.add(str(url.url))
-
-        # Get the second page
-        resp = flask_client.get(ds_url_pg.next_pg)
+        if metadata_ret_opt is None:
+            query_string = {}
+        else:
+            query_string = {"return_metadata": metadata_ret_opt.value}
 
+        resp = flask_client.get(_DATASET_URLS_PATH, query_string=query_string)
         assert resp.status_code == 200
 
-        resp_json = resp.json
-        ds_url_pg = DatasetURLPage.parse_obj(resp_json)
-
-        assert ds_url_pg.cur_pg_num == 2
-        assert ds_url_pg.prev_pg is not None
-        assert "next_pg" not in resp_json
-        assert ds_url_pg.next_pg is None
-        assert ds_url_pg.collection_stats.summary.ds_count == 4
-
-        prev_pg_lk, first_pg_lk, last_pg_lk = (
-            YURL(pg)
-            for pg in (ds_url_pg.prev_pg, ds_url_pg.first_pg, ds_url_pg.last_pg)
-        )
-
-        # Check page links
-        assert prev_pg_lk.query["page"] == "1"
-        # noinspection DuplicatedCode
-        assert first_pg_lk.query["page"] == "1"
-        assert last_pg_lk.query["page"] == "2"
-        for pg_lk in (prev_pg_lk, first_pg_lk, last_pg_lk):
-            assert pg_lk.path == "/api/v2/dataset-urls"
-
-            assert len(pg_lk.query) == 4
-            assert pg_lk.query["per_page"] == "2"
-            assert pg_lk.query["order_by"] == "last_update_dt"
-            assert pg_lk.query["order_dir"] == "desc"
-
-        assert len(ds_url_pg.dataset_urls) == 2
+        ds_urls = resp.json["dataset_urls"]
+        assert len(ds_urls) == 4
 
-        # Gather Dataset URLs from the second page
-        for url in ds_url_pg.dataset_urls:
-            ds_urls.add(str(url.url))
+        for ds_url in ds_urls:
+            assert None not in ds_url.values()
+            for m in ds_url.get("metadata", []):
+                assert None not in m.values()
 
-        assert ds_urls == set(populate_with_std_ds_urls)
+            if metadata_ret_opt is MetadataReturnOption.content:
+                assert (
+                    ds_url
+                    == flask_client.get(f"{_DATASET_URLS_PATH}/{ds_url['id']}").json
+                )
 
-    @pytest.mark.usefixtures("populate_with_std_ds_urls")
     @pytest.mark.parametrize(
-        "query_params, expected_results_by_id_prefix",
-        [
-            (
-                {
-                    "order_by": "url",
-                    "order_dir": "asc",
-                    "per_page": 2,
-                },
-                [2, 3, 4, 1],
-            ),
-            (
-                {
-                    "order_by": "url",
-                    "order_dir": "asc",
-                    "per_page": 1,
-                },
-                [2, 3, 4, 1],
-            ),
-            (
-                {
-                    "per_page": 3,
-                },
-                [2, 1, 3, 4],
-            ),
-            (
-                {
-                    "order_by": "git_objects_kb",
-                    "order_dir": "desc",
-                    "per_page": 1,
-                },
-                [3, 2, 1, 4],
-            ),
-            (
-                {
-                    "order_by": "git_objects_kb",
-                    "per_page": 1,
-                },
-                [3, 2, 1, 4],
-            ),
-            (
-                {
-                    "order_by": "annex_key_count",
-                    "order_dir": "asc",
-                    "per_page": 3,
-                },
-                [1, 2, 3, 4],
-            ),
-            (
-                {
-                    "order_by": "annex_key_count",
-                    "order_dir": "asc",
-                },
-                [1, 2, 3, 4],
-            ),
-        ],
-    )
-    def test_ordering(self, query_params, expected_results_by_id_prefix, flask_client):
-        """
-        Test the ordering of the results
-        """
-        next_pg: Optional[str] = None
-        results_by_id = []
-
-        while True:
-            if next_pg is None:
-                # Get the first page
-
-                resp = flask_client.get(
-                    "/api/v2/dataset-urls", query_string=query_params
-                )
-            else:
-                # Get a subsequent page
-
-                resp = flask_client.get(next_pg)
-
-            assert resp.status_code == 200
-
-            ds_url_pg = DatasetURLPage.parse_raw(resp.text)
-
-            results_by_id.extend(url.id for url in ds_url_pg.dataset_urls)
-
-            if ds_url_pg.next_pg is not None:
-                # === There is a subsequent page ===
-                next_pg = ds_url_pg.next_pg
-            else:
-                # === There is no subsequent page ===
-                break
-
-        assert (
-            results_by_id[: len(expected_results_by_id_prefix)]
-            == expected_results_by_id_prefix
-        )
-
-    @pytest.mark.parametrize(
-        "query_params, expected_stats",
+        "query_params, expected_stats",
         [
             (
                 {},
@@ -797,6 +594,13 @@ class TestDatasetURLs:
                 ),
             ),
         ],
+        ids=[
+            "no_search",
+            "search_url_datalad",
+            "search_url_org",
+            "search_url_tv_no_match",
+            "search_url_distribits",
+        ],
     )
     def test_stats(self, query_params, expected_stats, flask_app, flask_client):
         """
@@ -805,7 +609,7 @@ class TestDatasetURLs:
 
         # Populate the DB with dataset URLs suitable for testing the stats
         urls = [
-            RepoUrl(
+            dict(
                 url="https://www.example.com",
                 ds_id=None,
                 annexed_files_in_wt_count=100,
@@ -817,7 +621,7 @@ class TestDatasetURLs:
                     }
                 },
             ),
-            RepoUrl(
+            dict(
                 url="http://www.datalad.org",
                 ds_id="2a0b7b7b-a984-4c4a-844c-be3132291a7c",
                 annexed_files_in_wt_count=120,
@@ -829,7 +633,7 @@ class TestDatasetURLs:
                     }
                 },
             ),
-            RepoUrl(
+            dict(
                 url="https://handbook.datalad.org",
                 ds_id="2b73b99e-59cc-4f35-833a-69c75ca5b0c5",
                 annexed_files_in_wt_count=50,
@@ -841,13 +645,13 @@ class TestDatasetURLs:
                     }
                 },
             ),
-            RepoUrl(
+            dict(
                 url="https://www.dandiarchive.org",
                 ds_id=None,
                 annexed_files_in_wt_count=100,
                 annexed_files_in_wt_size=300,
             ),
-            RepoUrl(
+            dict(
                 url="https://distribits.live",
                 ds_id="2a0b7b7b-a984-4c4a-844c-be3132291a7c",
                 annexed_files_in_wt_count=100,
@@ -859,7 +663,7 @@ class TestDatasetURLs:
                     }
                 },
             ),
-            RepoUrl(
+            dict(
                 url="https://distribits.live/1",
                 ds_id="48185fb3-aa80-47b4-8ab1-1d7d9fc8b192",
                 annexed_files_in_wt_count=120,
@@ -871,7 +675,7 @@ class TestDatasetURLs:
                     }
                 },
             ),
-            RepoUrl(
+            dict(
                 url="https://distribits.live/2",
                 ds_id="48185fb3-aa80-47b4-8ab1-1d7d9fc8b192",
                 annexed_files_in_wt_count=150,
@@ -883,7 +687,7 @@ class TestDatasetURLs:
                     }
                 },
             ),
-            RepoUrl(
+            dict(
                 url="https://distribits.live/3",
                 ds_id="48185fb3-aa80-47b4-8ab1-1d7d9fc8b192",
                 annexed_files_in_wt_count=130,
@@ -895,7 +699,7 @@ class TestDatasetURLs:
                     }
                 },
             ),
-            RepoUrl(
+            dict(
                 url="https://centerforopenneuroscience.org",
                 ds_id=None,
                 annexed_files_in_wt_count=None,
@@ -914,27 +718,415 @@ class TestDatasetURLs:
         ]
         populate_with_dataset_urls(urls, flask_app)
 
-        resp = flask_client.get("/api/v2/dataset-urls", query_string=query_params)
+        resp = flask_client.get(_DATASET_URLS_PATH, query_string=query_params)
+
+        assert DatasetURLPage.parse_obj(resp.json).collection_stats == expected_stats
+
+
+@pytest.mark.usefixtures("class_scoped_std_ds_urls")
+class TestDatasetURLsWithStdDsUrls:
+    """
+    Tests of getting dataset URLs that only read the standard dataset URLs populated
+    in the database once for all the tests in this class
+    """
+
+    @pytest.fixture
+    def flask_client(self, std_ds_urls_flask_client):
+        return std_ds_urls_flask_client
+
+    @pytest.mark.parametrize(
+        "query_params, expected_output",
+        [
+            (
+                {},
+                frozenset({_EXAMPLE_URL, _DATALAD_URL, _HANDBOOK_URL, _DANDI_URL}),
+            ),
+            ({"url": _EXAMPLE_URL}, frozenset({_EXAMPLE_URL})),
+            (
+                {"ds_id": "2a0b7b7b-a984-4c4a-844c-be3132291d7c"},
+                frozenset({_DATALAD_URL}),
+            ),
+            (
+                {"min_annex_key_count": "39"},
+                frozenset({_DATALAD_URL, _HANDBOOK_URL}),
+            ),
+            (
+                {"min_annex_key_count": "39", "max_annex_key_count": 40},
+                frozenset({_DATALAD_URL}),
+            ),
+            (
+                {
+                    "min_annexed_files_in_wt_count": 190,
+                    "max_annexed_files_in_wt_count": 500,
+                },
+                frozenset({_EXAMPLE_URL, _HANDBOOK_URL}),
+            ),
+            ({"min_annexed_files_in_wt_size": 1000_001}, frozenset()),
+            ({"max_annexed_files_in_wt_size": 500}, frozenset({_DATALAD_URL})),
+            (
+                {"max_annexed_files_in_wt_size": 2000},
+                frozenset({_EXAMPLE_URL, _DATALAD_URL}),
+            ),
+            (
+                {
+                    "min_annexed_files_in_wt_size": 300,
+                    "max_annexed_files_in_wt_size": 2200,
+                },
+                frozenset({_EXAMPLE_URL, _DATALAD_URL}),
+            ),
+            (
+                {"earliest_last_update": "2001-03-22T01:22:34"},
+                frozenset({_EXAMPLE_URL, _DATALAD_URL, _HANDBOOK_URL}),
+            ),
+            (
+                {
+                    "earliest_last_update": "2007-03-22T01:22:34",
+                    "latest_last_update": "2009-03-22T01:22:34",
+                },
+                frozenset({_EXAMPLE_URL}),
+            ),
+            (
+                {"min_git_objects_kb": 1000, "max_git_objects_kb": 2000},
+                frozenset({_DATALAD_URL}),
+            ),
+            (
+                {"processed": True},
+                frozenset({_EXAMPLE_URL, _DATALAD_URL, _HANDBOOK_URL}),
+            ),
+            ({"processed": False}, frozenset({_DANDI_URL})),
+            (
+                {"min_annex_key_count": "39", "max_annexed_files_in_wt_size": 2200},
+                frozenset({_DATALAD_URL}),
+            ),
+            # === filtered by cache_path ===
+            (
+                {"cache_path": _EXAMPLE_CACHE_PATH},
+                frozenset({_EXAMPLE_URL}),
+            ),
+            (
+                {"cache_path": f"{_EXAMPLE_CACHE_PATH}/"},
+                frozenset({_EXAMPLE_URL}),
+            ),
+            (
+                {"cache_path": f"{_EXAMPLE_CACHE_PATH}//"},
+                frozenset({_EXAMPLE_URL}),
+            ),
+            (
+                {"cache_path": f"/a/c/{_EXAMPLE_CACHE_PATH}"},
+                frozenset({_EXAMPLE_URL}),
+            ),
+            (
+                {"cache_path": f"/{_EXAMPLE_CACHE_PATH}"},
+                frozenset({_EXAMPLE_URL}),
+            ),
+            (
+                {"cache_path": f"a/c/{_EXAMPLE_CACHE_PATH}"},
+                frozenset(),
+            ),
+            (
+                {"cache_path": "72e/4e5/4184da47e282c02ae7e568ba74"},
+                frozenset({_HANDBOOK_URL}),
+            ),
+            (
+                {"cache_path": "a/b/c"},
+                frozenset({_DANDI_URL}),
+            ),
+            # === filtered by search ===
+            (
+                {"search": "Handbook"},
+                frozenset({_HANDBOOK_URL}),
+            ),
+            (
+                {"search": "ds_id:be3132291d7b"},
+                frozenset({_EXAMPLE_URL}),
+            ),
+            (
+                {"search": "ds_id:be3132291d7c OR dandiarchive"},
+                frozenset({_DATALAD_URL, _DANDI_URL}),
+            ),
+            # === filtered by search and other query params ===
+            (
+                {"search": "ds_id:2a0b7b7b", "min_annex_key_count": "39"},
+                frozenset({_DATALAD_URL, _HANDBOOK_URL}),
+            ),
+            (
+                {"search": "url:.org", "max_annexed_files_in_wt_size": 401},
+                frozenset({_DATALAD_URL}),
+            ),
+        ],
+    )
+    def test_filter(self, flask_client, query_params, expected_output):
+        expected_out_count = len(expected_output)
 
-        assert DatasetURLPage.parse_raw(resp.text).collection_stats == expected_stats
+        resp = flask_client.get(_DATASET_URLS_PATH, query_string=query_params)
+        assert resp.status_code == 200
+
+        ds_url_page = DatasetURLPage.parse_obj(resp.json)
+
+        assert ds_url_page.cur_pg_num == DEFAULT_PAGE
+        assert ds_url_page.prev_pg is None
+        assert ds_url_page.next_pg is None
+        assert YURL(ds_url_page.first_pg).query["page"] == "1"
+        assert YURL(ds_url_page.last_pg).query["page"] == "1"
+        assert ds_url_page.collection_stats.summary.ds_count == expected_out_count
+
+        # Check the collection of dataset URLs
+        assert frozenset(i.url for i in ds_url_page.dataset_urls) == expected_output
+
+    @pytest.mark.parametrize(
+        "query_params",
+        [
+            {"search": "unknown_field:example"},
+            {"search": "url:example OR no_body:knows"},
+            {"url": "https://www.example.com", "search": "never:encountered"},
+        ],
+    )
+    def test_filter_with_invalid_search_query_param(self, query_params, flask_client):
+        """
+        Test filtering with a search query parameter with invalid grammar/syntax
+        """
+        resp = flask_client.get(_DATASET_URLS_PATH, query_string=query_params)
+        assert resp.status_code == 400
+        assert "Grammar" in resp.json["description"]
+
+    @pytest.mark.parametrize(
+        "query_params",
+        [
+            # No pure annex dataset in the collection
+            {},
+            # Empty collection
+            {"url": "https://www.nonexistent.org"},
+        ],
+        ids=["no_pure_annex_ds", "empty_collection"],
+    )
+    def test_collection_stats_without_nulls(self, query_params, flask_client):
+        """
+        Test that the stats that are not available are absent from the raw JSON of
+        the collection stats rather than being `null`
+        """
+
+        def assert_no_null(obj: Any) -> None:
+            assert obj is not None
+            if isinstance(obj, dict):
+                for v in obj.values():
+                    assert_no_null(v)
+
+        resp = flask_client.get(_DATASET_URLS_PATH, query_string=query_params)
+        assert resp.status_code == 200
+
+        collection_stats = resp.json["collection_stats"]
+
+        assert_no_null(collection_stats)
+        assert collection_stats["pure_annex_ds_stats"] == {"ds_count": 0}
+
+    def test_pagination(self, class_scoped_std_ds_urls, flask_client):
+        """
+        Test the pagination of the results
+        """
+
+        # For storing all URLs obtained from all pages
+        ds_urls: set[str] = set()
+
+        # Get the first page
+        resp = flask_client.get(_DATASET_URLS_PATH, query_string={"per_page": 2})
+
+        assert resp.status_code == 200
+
+        resp_json = resp.json
+        ds_url_pg = DatasetURLPage.parse_obj(resp_json)
+
+        assert ds_url_pg.cur_pg_num == 1
+        assert "prev_pg" not in resp_json
+        assert ds_url_pg.prev_pg is None
+        assert ds_url_pg.next_pg is not None
+        assert ds_url_pg.collection_stats.summary.ds_count == 4
+
+        # Check page links
+        _check_pg_lks(
+            [
+                (ds_url_pg.next_pg, "2"),
+                (ds_url_pg.first_pg, "1"),
+                (ds_url_pg.last_pg, "2"),
+            ]
+        )
+
+        assert len(ds_url_pg.dataset_urls) == 2
+
+        # Gather Dataset URLs from the first page
+        for url in ds_url_pg.dataset_urls:
+            ds_urls.add(str(url.url))
+
+        # Get the second page
+        resp = _get_pg(flask_client, ds_url_pg.next_pg)
+
+        assert resp.status_code == 200
+
+        resp_json = resp.json
+        ds_url_pg = DatasetURLPage.parse_obj(resp_json)
+
+        assert ds_url_pg.cur_pg_num == 2
+        assert ds_url_pg.prev_pg is not None
+        assert "next_pg" not in resp_json
+        assert ds_url_pg.next_pg is None
+        assert ds_url_pg.collection_stats.summary.ds_count == 4
+
+        # Check page links
+        _check_pg_lks(
+            [
+                (ds_url_pg.prev_pg, "1"),
+                (ds_url_pg.first_pg, "1"),
+                (ds_url_pg.last_pg, "2"),
+            ]
+        )
+
+        assert len(ds_url_pg.dataset_urls) == 2
+
+        # Gather Dataset URLs from the second page
+        for url in ds_url_pg.dataset_urls:
+            ds_urls.add(str(url.url))
+
+        assert ds_urls == set(class_scoped_std_ds_urls)
+
+    @pytest.mark.parametrize(
+        "query_params, expected_results_by_id_prefix",
+        [
+            (
+                {
+                    "order_by": "url",
+                    "order_dir": "asc",
+                    "per_page": 2,
+                },
+                [2, 3, 4, 1],
+            ),
+            (
+                {
+                    "order_by": "url",
+                    "order_dir": "asc",
+                    "per_page": 1,
+                },
+                [2, 3, 4, 1],
+            ),
+            (
+                {
+                    "per_page": 3,
+                },
+                [2, 1, 3, 4],
+            ),
+            (
+                {
+                    "order_by": "git_objects_kb",
+                    "order_dir": "desc",
+                    "per_page": 1,
+                },
+                [3, 2, 1, 4],
+            ),
+            (
+                {
+                    "order_by": "git_objects_kb",
+                    "per_page": 1,
+                },
+                [3, 2, 1, 4],
+            ),
+            (
+                {
+                    "order_by": "annex_key_count",
+                    "order_dir": "asc",
+                    "per_page": 3,
+                },
+                [1, 2, 3, 4],
+            ),
+            (
+                {
+                    "order_by": "annex_key_count",
+                    "order_dir": "asc",
+                },
+                [1, 2, 3, 4],
+            ),
+        ],
+    )
+    def test_ordering(self, query_params, expected_results_by_id_prefix, flask_client):
+        """
+        Test the ordering of the results
+        """
+        next_pg: Optional[str] = None
+        results_by_id = []
+
+        while True:
+            if next_pg is None:
+                # Get the first page
+
+                resp = flask_client.get(_DATASET_URLS_PATH, query_string=query_params)
+            else:
+                # Get a subsequent page
+
+                resp = _get_pg(flask_client, next_pg)
+
+            assert resp.status_code == 200
+
+            ds_url_pg = DatasetURLPage.parse_obj(resp.json)
+
+            results_by_id.extend(url.id for url in ds_url_pg.dataset_urls)
+
+            if len(results_by_id) >= len(expected_results_by_id_prefix):
+                # === Enough results have been obtained for the check ===
+                # (There is no need to get the remaining pages.)
+                break
+
+            if ds_url_pg.next_pg is not None:
+                # === There is a subsequent page ===
+                next_pg = ds_url_pg.next_pg
+            else:
+                # === There is no subsequent page ===
+                break
+
+        assert (
+            results_by_id[: len(expected_results_by_id_prefix)]
+            == expected_results_by_id_prefix
+        )
 
 
 @pytest.mark.usefixtures("populate_with_2_dataset_urls")
 class TestDatasetURL:
     @pytest.mark.parametrize("dataset_url_id", [-100, -1, 0, 2, 60, 71, 100])
     def test_invalid_id(self, flask_client, dataset_url_id):
-        resp = flask_client.get(f"/api/v2/dataset-urls/{dataset_url_id}")
+        resp = flask_client.get(f"{_DATASET_URLS_PATH}/{dataset_url_id}")
         assert resp.status_code == 404
 
     @pytest.mark.parametrize(
         "dataset_url_id, url", [(1, "https://example.com"), (3, "/foo/bar")]
     )
     def test_valid_id(self, flask_client, dataset_url_id, url):
-        resp = flask_client.get(f"/api/v2/dataset-urls/{dataset_url_id}")
+        resp = flask_client.get(f"{_DATASET_URLS_PATH}/{dataset_url_id}")
         assert resp.status_code == 200
 
         # Ensure the response body is valid
-        ds_url = DatasetURLRespModel.parse_raw(resp.text)
+        ds_url = DatasetURLRespModel.parse_obj(resp.json)
 
         # Ensure the correct URL is fetched
         assert str(ds_url.url) == url
+
+    @pytest.mark.parametrize("dataset_url_id", [1, 3])
+    def test_conditional_get(self, flask_client, dataset_url_id):
+        """
+        Test getting a dataset URL conditionally with the ETag of its representation
+        """
+        resp = flask_client.get(f"{_DATASET_URLS_PATH}/{dataset_url_id}")
+        assert resp.status_code == 200
+
+        etag = resp.headers.get("ETag")
+        assert etag is not None
+
+        # The representation has not changed
+        resp = flask_client.get(
+            f"{_DATASET_URLS_PATH}/{dataset_url_id}", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+        # The ETag doesn't match
+        resp = flask_client.get(
+            f"{_DATASET_URLS_PATH}/{dataset_url_id}",
+            headers={"If-None-Match": '"not-a-matching-etag"'},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] == etag
@@ -148,6 +148,29 @@ class TestBaseConfig:
             worker_max_memory_per_child=500_000,  # 500 MB
         )
 
+    @pytest.mark.parametrize(
+        "query_cache_size, expected_query_cache_size",
+        [(None, 1200), ("500", 500), ("3000", 3000)],
+    )
+    def test_sqlalchemy_engine_options(
+        self, query_cache_size, expected_query_cache_size, monkeypatch
+    ):
+        if query_cache_size is not None:
+            monkeypatch.setenv(
+                "DATALAD_REGISTRY_SQLA_QUERY_CACHE_SIZE", query_cache_size
+            )
+
+        # noinspection PyTypeChecker
+        assert BaseConfig(
+            DATALAD_REGISTRY_OPERATION_MODE=OperationMode.PRODUCTION,
+            DATALAD_REGISTRY_INSTANCE_PATH=Path("/a/b"),
+            DATALAD_REGISTRY_DATASET_CACHE=Path("/a/b"),
+            DATALAD_REGISTRY_WEB_API_URL="http://web/api",
+            CELERY_BROKER_URL="redis://localhost",
+            CELERY_RESULT_BACKEND="redis://localhost",
+            SQLALCHEMY_DATABASE_URI="postgresql+psycopg2://usr:pd@db:5432/dbn",
+        ).SQLALCHEMY_ENGINE_OPTIONS == dict(query_cache_size=expected_query_cache_size)
+
 
 class TestUpperLevelConfigs:
     @pytest.mark.parametrize(
@@ -215,24 +215,22 @@ class TestExtractDsMeta:
         """
         repo_url = repo_url_with_up_to_date_clone[0]
 
-        def mock_parse_obj_as(*_args, **_kwargs):
-            return [
-                MetaExtractResult(
-                    action="meta_extract",
-                    status="FAILED",
-                    metadata_record=MetadataRecord(
-                        dataset_version="abcde",
-                        extractor_name=_BASIC_EXTRACTOR,
-                        extractor_version="0.0.1",
-                        extraction_parameter={},
-                        extracted_metadata={"hello": "world"},
-                    ),
-                )
-            ]
+        def mock_meta_extract(*_args, **_kwargs):
+            yield MetaExtractResult(
+                action="meta_extract",
+                status="FAILED",
+                metadata_record=MetadataRecord(
+                    dataset_version="abcde",
+                    extractor_name=_BASIC_EXTRACTOR,
+                    extractor_version="0.0.1",
+                    extraction_parameter={},
+                    extracted_metadata={"hello": "world"},
+                ),
+            ).dict()
 
         from datalad_registry import tasks
 
-        monkeypatch.setattr(tasks, "parse_obj_as", mock_parse_obj_as)
+        monkeypatch.setattr(tasks.dl, "meta_extract", mock_meta_extract)
 
         with pytest.raises(RuntimeError, match="The returned execution status"):
             extract_ds_meta(repo_url.id, _BASIC_EXTRACTOR)
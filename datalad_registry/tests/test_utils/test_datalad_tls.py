@@ -1,16 +1,23 @@
 from pathlib import Path
+import re
+import subprocess
 from uuid import UUID
 
 from datalad.api import Dataset
 import pytest
 
+from datalad_registry.utils import datalad_tls
 from datalad_registry.utils.datalad_tls import (
+    AnnexInfo,
     WtAnnexedFileInfo,
     clone,
+    get_annex_info,
+    get_head_hexsha,
     get_origin_annex_key_count,
     get_origin_annex_uuid,
     get_origin_branches,
     get_origin_default_branch,
+    get_origin_ref_info,
     get_origin_upstream_branch,
     get_wt_annexed_file_info,
 )
@@ -19,6 +26,24 @@ _TEST_MIN_DATASET_URL = "https://github.com/datalad/testrepo--minimalds.git"
 _TEST_MIN_DATASET_ID = "e7f3d914-e971-11e8-a371-f0d5bf7b5561"
 
 
+@pytest.fixture(scope="session")
+def min_dataset_mirror(tmp_path_factory) -> Path:
+    """
+    A local mirror of the minimal dataset at `_TEST_MIN_DATASET_URL`, made once for
+    the test session to be cloned from in place of the remote dataset
+
+    Note: The mirror is a bare repo made by `git clone --mirror`. Unlike a clone
+          made by DataLad, it is not initialized as a git-annex repo. Thus, as with
+          the remote dataset, the origin remote of a clone of the mirror has no annex
+          UUID.
+    """
+    path = tmp_path_factory.mktemp("min_ds_mirror")
+    subprocess.run(
+        ["git", "clone", "--mirror", _TEST_MIN_DATASET_URL, str(path)], check=True
+    )
+    return path
+
+
 class TestClone:
     @pytest.mark.parametrize(
         "return_type",
@@ -52,11 +77,11 @@ class TestClone:
         with pytest.raises(RuntimeError):
             clone(source=_TEST_MIN_DATASET_URL, path=tmp_path)
 
-    def test_clone_minimal_dataset(self, tmp_path):
+    def test_clone_minimal_dataset(self, min_dataset_mirror, tmp_path):
         """
         Test cloning a minimal dataset used for testing
         """
-        ds = clone(source=_TEST_MIN_DATASET_URL, path=tmp_path)
+        ds = clone(source=str(min_dataset_mirror), path=tmp_path)
         assert ds.id == _TEST_MIN_DATASET_ID
 
 
@@ -81,12 +106,12 @@ class TestGetOriginAnnexUuid:
         ds_clone = clone(source=ds.path, path=tmp_path)
         assert get_origin_annex_uuid(ds_clone) is None
 
-    def test_origin_annex_uuid_not_exist(self, tmp_path):
+    def test_origin_annex_uuid_not_exist(self, min_dataset_mirror, tmp_path):
         """
         Test the case that the origin remote has no annex UUID even though it is an
         annex repo
         """
-        ds = clone(source=_TEST_MIN_DATASET_URL, path=tmp_path)
+        ds = clone(source=str(min_dataset_mirror), path=tmp_path)
         assert get_origin_annex_uuid(ds) is None
 
 
@@ -144,6 +169,58 @@ class TestGetWtAnnexedFileInfo:
         assert get_wt_annexed_file_info(ds) is None
 
 
+class TestGetAnnexInfo:
+    @pytest.mark.parametrize(
+        "ds_name, expected_info",
+        [
+            ("empty_ds_annex", AnnexInfo(0, WtAnnexedFileInfo(0, 0))),
+            ("two_files_ds_annex", AnnexInfo(2, WtAnnexedFileInfo(2, 38))),
+        ],
+    )
+    def test_annex_repo(self, ds_name, expected_info, request, tmp_path):
+        """
+        Test the case that the given dataset is a git-annex repo
+        """
+        ds = request.getfixturevalue(ds_name)
+        ds_clone = clone(source=ds.path, path=tmp_path)
+        annex_info = get_annex_info(ds_clone)
+        assert annex_info == expected_info
+        assert type(annex_info.origin_annex_key_count) is int
+
+    @pytest.mark.parametrize(
+        "ds_name", ["empty_ds_non_annex", "two_files_ds_non_annex"]
+    )
+    def test_non_annex_repo(self, ds_name, request, tmp_path):
+        """
+        Test the case that the given dataset is not a git-annex repo
+        """
+        ds = request.getfixturevalue(ds_name)
+        ds_clone = clone(source=ds.path, path=tmp_path)
+        assert get_annex_info(ds_clone) is None
+
+
+class TestGetHeadHexsha:
+    @pytest.mark.parametrize(
+        "ds_name",
+        [
+            "empty_ds_annex",
+            "two_files_ds_annex",
+            "empty_ds_non_annex",
+            "two_files_ds_non_annex",
+        ],
+    )
+    def test_dataset(self, ds_name, request):
+        ds: Dataset = request.getfixturevalue(ds_name)
+        assert get_head_hexsha(ds.pathobj) == ds.repo.get_hexsha()
+
+    def test_no_dataset(self, tmp_path):
+        """
+        Test the case that there is no dataset at the given path
+        """
+        with pytest.raises(subprocess.CalledProcessError):
+            get_head_hexsha(tmp_path)
+
+
 @pytest.mark.parametrize(
     "ds_name",
     [
@@ -159,21 +236,52 @@ def test_get_origin_branches(ds_name, request, tmp_path):
 
     origin_branches = get_origin_branches(ds_clone)
 
-    branch_names = set(ds.repo.get_branches())
+    # The expected branches, as the local branches of the original dataset, collected
+    # with a single invocation of `git for-each-ref`
+    expected_branches = {}
+    for line in ds.repo.call_git_items_(
+        [
+            "for-each-ref",
+            "--format=%(refname:strip=2) %(objectname) %(authordate:iso8601-strict)",
+            "refs/heads/",
+        ]
+    ):
+        branch_name, hexsha, last_commit_dt = line.split(" ")
+        expected_branches[branch_name] = {
+            "hexsha": hexsha,
+            "last_commit_dt": last_commit_dt,
+        }
 
-    assert set(origin_branches) == branch_names
+    assert set(expected_branches) == set(ds.repo.get_branches())
+    assert origin_branches == expected_branches
 
-    for o_b_name, o_b_data in origin_branches.items():
-        assert o_b_data == {
-            "hexsha": ds.repo.get_hexsha(o_b_name),
-            "last_commit_dt": ds.repo.call_git(
-                ["log", "-1", "--format=%aI", o_b_name]
-            ).strip(),
-        }
 
+@pytest.mark.parametrize(
+    "ds_name",
+    [
+        "empty_ds_annex",
+        "two_files_ds_annex",
+        "empty_ds_non_annex",
+        "two_files_ds_non_annex",
+    ],
+)
+def test_get_origin_ref_info(ds_name, request, tmp_path):
+    ds: Dataset = request.getfixturevalue(ds_name)
+    ds_clone = clone(source=ds.path, path=tmp_path)
+
+    # Add a lightweight tag and an annotated tag
+    ds_clone.repo.call_git(["tag", "v1"])
+    ds_clone.repo.call_git(["tag", "-a", "v2", "-m", "Annotated tag"])
+
+    origin_ref_info = get_origin_ref_info(ds_clone)
+
+    assert origin_ref_info.head == ds_clone.repo.get_hexsha("origin/HEAD")
+    assert origin_ref_info.branches == get_origin_branches(ds_clone)
+    assert origin_ref_info.tags == ds_clone.repo.get_tags()
 
-def _mock_no_match_re_search(*_args, **_kwargs):
-    return None
+
+# A pattern that matches nothing
+_NO_MATCH_PATTERN = re.compile(r"(?!)")
 
 
 def _two_level_clone(ds: Dataset, dir_path: Path) -> tuple[Dataset, Dataset]:
@@ -205,9 +313,9 @@ class TestGetOriginDefaultBranch:
 
         with pytest.raises(RuntimeError, match="Failed to extract the name"):
             with monkeypatch.context() as m:
-                import re
-
-                m.setattr(re, "search", _mock_no_match_re_search)
+                m.setattr(
+                    datalad_tls, "_ORIGIN_DEFAULT_BRANCH_PATTERN", _NO_MATCH_PATTERN
+                )
                 get_origin_default_branch(ds_clone)
 
     @pytest.mark.parametrize(
@@ -245,9 +353,9 @@ class TestGetOriginUpstreamBranch:
 
         with pytest.raises(RuntimeError, match="Failed to extract the name"):
             with monkeypatch.context() as m:
-                import re
-
-                m.setattr(re, "search", _mock_no_match_re_search)
+                m.setattr(
+                    datalad_tls, "_ORIGIN_UPSTREAM_BRANCH_PATTERN", _NO_MATCH_PATTERN
+                )
                 get_origin_upstream_branch(ds_clone)
 
     @pytest.mark.parametrize(
@@ -2,7 +2,10 @@ from pathlib import Path
 
 import pytest
 
-from datalad_registry.utils.pydantic_tls import path_must_be_absolute
+from datalad_registry.utils.pydantic_tls import (
+    path_must_be_absolute,
+    path_url_must_be_absolute,
+)
 
 
 class TestPathMustBeAbsolute:
@@ -15,3 +18,16 @@ class TestPathMustBeAbsolute:
     def test_relative_path(self, path: Path):
         with pytest.raises(ValueError):
             path_must_be_absolute(path)
+
+
+class TestPathUrlMustBeAbsolute:
+    @pytest.mark.parametrize(
+        "url", [Path("/a/b"), Path("/"), "https://example.com", "file:///a/b"]
+    )
+    def test_valid_url(self, url):
+        assert path_url_must_be_absolute(url) == url
+
+    @pytest.mark.parametrize("url", [Path("a/b"), Path("a")])
+    def test_relative_path_url(self, url: Path):
+        with pytest.raises(ValueError, match="Path URLs must be absolute"):
+            path_url_must_be_absolute(url)
@@ -1,22 +1,58 @@
 # This file contains helper functions for testing purposes
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
 from flask import Flask
+from sqlalchemy import insert
 
 from datalad_registry.models import RepoUrl, db
 
 
-def populate_with_dataset_urls(urls: list[RepoUrl], flask_app: Flask) -> list[str]:
+def populate_with_dataset_urls(
+    urls: list[dict[str, Any]], flask_app: Flask
+) -> list[str]:
     """
-    Populate the `repo_url` table with a list of RepoUrl objects
+    Populate the `repo_url` table with a list of dataset URLs
 
-    :param urls: The list of RepoUrl objects to populate
+    :param urls: The list of dataset URLs to populate, each expressed as a dictionary
+                 of the values of the columns of a `RepoUrl` record. The columns
+                 omitted take their default values.
     :param flask_app: The Flask app instance which provides the context for
                       database access
     :return: The list of URLs, expressed in `str`, that were added to the database
+
+    Note: The dataset URLs are inserted in bulk, with a single `INSERT` statement
+          for each run of consecutive dataset URLs specifying the same set of columns,
+          instead of as `RepoUrl` objects one by one through the unit of work of
+          the ORM. The IDs of the dataset URLs are assigned in the order of the list.
     """
 
     with flask_app.app_context():
-        db.session.add_all(urls)
+        db.session.execute(insert(RepoUrl), urls)
         db.session.commit()
 
-        return [url.url for url in urls]
+    return [url["url"] for url in urls]
+
+
+@contextmanager
+def swap_attr(obj: Any, name: str, value: Any) -> Iterator[None]:
+    """
+    Context manager that replaces an attribute of an object with a given value
+    and restores the original value upon exit
+
+    :param obj: The object of which the attribute is to be replaced
+    :param name: The name of the attribute
+    :param value: The value to replace the attribute with within the context
+
+    Note: This is a lightweight alternative to `pytest.MonkeyPatch.setattr` for
+          tests that replace a single attribute in a limited scope.
+    """
+
+    original = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, original)
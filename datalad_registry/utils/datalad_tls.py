@@ -1,11 +1,21 @@
 from dataclasses import dataclass
+from pathlib import Path
 import re
+import subprocess
 from typing import Optional
 from uuid import UUID
 
 from datalad import api as dl
 from datalad.api import Dataset
 
+# Pattern for extracting the name of the default branch of the origin remote from
+# the output of `git ls-remote --symref origin HEAD`
+_ORIGIN_DEFAULT_BRANCH_PATTERN = re.compile(r"ref: refs/heads/(\S+)\s+HEAD")
+
+# Pattern for extracting the name of the upstream branch at the origin remote from
+# the output of `git rev-parse --abbrev-ref --symbolic-full-name @{u}`
+_ORIGIN_UPSTREAM_BRANCH_PATTERN = re.compile(r"origin/(\S+)")
+
 
 @dataclass
 class WtAnnexedFileInfo:
@@ -14,10 +24,45 @@ class WtAnnexedFileInfo:
     that is a git-annex repo
     """
 
+    # Note: The attributes are stored in slots instead of an instance `__dict__`.
+    #       `dataclass(slots=True)` is not used since it requires Python 3.10+.
+    __slots__ = ("count", "size")
+
     count: int
     size: int
 
 
+@dataclass
+class AnnexInfo:
+    """
+    Represent information reported by `git annex info` about a datalad dataset
+    that is a git-annex repo
+    """
+
+    # The "remote annex keys" of the origin remote of the dataset
+    origin_annex_key_count: int
+
+    # Information about annexed files in the working tree of the dataset
+    wt_annexed_file_info: WtAnnexedFileInfo
+
+
+@dataclass
+class OriginRefInfo:
+    """
+    Represent information about the refs of a datalad dataset that are related to
+    the origin remote of the dataset
+    """
+
+    # The hexsha of the commit pointed to by `origin/HEAD`
+    head: str
+
+    # The branches of the origin remote, in the form returned by `get_origin_branches`
+    branches: dict[str, dict[str, str]]
+
+    # The tags of the dataset, in the form returned by `GitRepo.get_tags`
+    tags: list[dict[str, str]]
+
+
 def clone(*args, **kwargs) -> dl.Dataset:
     """
     Clone (copy) a dataset from a given URL or local directory
@@ -94,6 +139,51 @@ def get_wt_annexed_file_info(ds: Dataset) -> Optional[WtAnnexedFileInfo]:
         return None
 
 
+def get_annex_info(ds: Dataset) -> Optional[AnnexInfo]:
+    """
+    Get the "remote annex keys" of the origin remote of a given datalad dataset
+    and information about annexed files in the working tree of the dataset
+
+    :param ds: The given dataset
+    :return: In the case that the dataset is a git-annex repo, the information is
+             returned. In the case that the dataset is not a git-annex repo,
+             return None.
+
+    Note: This function is equivalent to, but faster than, calling
+          `get_origin_annex_key_count(ds)` and `get_wt_annexed_file_info(ds)`.
+          It collects the information with a single invocation of
+          `git annex info`, which reports on each of the given items, the working
+          tree and the origin remote, in a separate record.
+    """
+    if not ds.repo.is_with_annex():
+        return None
+
+    origin_annex_key_count: Optional[int] = None
+    wt_annexed_file_info: Optional[WtAnnexedFileInfo] = None
+
+    for annex_record in ds.repo.call_annex_records(
+        ["info", "--bytes"], [".", "origin"]
+    ):
+        if "remote annex keys" in annex_record:
+            origin_annex_key_count = annex_record["remote annex keys"]
+        elif "annexed files in working tree" in annex_record:
+            wt_annexed_file_info = WtAnnexedFileInfo(
+                count=annex_record["annexed files in working tree"],
+                size=int(annex_record["size of annexed files in working tree"]),
+            )
+
+    if origin_annex_key_count is None or wt_annexed_file_info is None:
+        raise RuntimeError(
+            "Failed to obtain the expected records from the output of "
+            "`git annex info --bytes . origin`"
+        )
+
+    return AnnexInfo(
+        origin_annex_key_count=origin_annex_key_count,
+        wt_annexed_file_info=wt_annexed_file_info,
+    )
+
+
 def get_head_describe(ds: Dataset) -> str:
     """
     Get the output of `git describe --tags --always` of a given dataset
@@ -104,6 +194,27 @@ def get_head_describe(ds: Dataset) -> str:
     return ds.repo.describe(tags=True, always=True)
 
 
+def get_head_hexsha(ds_path: Path) -> str:
+    """
+    Get the hexsha of the HEAD commit of a dataset at a given path
+
+    :param ds_path: The path of the dataset
+    :return: The hexsha of the HEAD commit of the dataset
+    :raises subprocess.CalledProcessError: If the hexsha can't be obtained, e.g.
+                                           there is no dataset at the given path
+
+    Note: This function runs `git rev-parse` directly, sparing the instantiation of
+          a `Dataset` object and its repo object, with their checks, just to read
+          the HEAD of the dataset.
+    """
+    return subprocess.run(
+        ["git", "-C", str(ds_path), "rev-parse", "--verify", "HEAD"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.strip()
+
+
 def get_origin_branches(ds: Dataset) -> dict[str, dict[str, str]]:
     """
     Get the branches of the origin remote of a given dataset
@@ -130,6 +241,60 @@ def get_origin_branches(ds: Dataset) -> dict[str, dict[str, str]]:
     }
 
 
+def get_origin_ref_info(ds: Dataset) -> OriginRefInfo:
+    """
+    Get the hexsha of `origin/HEAD`, the branches of the origin remote, and the tags of
+    a given dataset
+
+    :param ds: The given dataset
+    :return: The information about the refs, collected from a single invocation
+             of `git for-each-ref`
+    :raises RuntimeError: If `origin/HEAD` is not found in the given dataset
+
+    Note: This function is equivalent to, but faster than, calling
+          `ds.repo.get_hexsha("origin/HEAD")`, `get_origin_branches(ds)`, and
+          `ds.repo.get_tags()` one after another, each of which spawns
+          a git process.
+    """
+    origin_prefix = "refs/remotes/origin/"
+    tag_prefix = "refs/tags/"
+
+    head: Optional[str] = None
+    branches: dict[str, dict[str, str]] = {}
+    tags: list[dict[str, str]] = []
+
+    # Note: Sorting by creator date yields the tags in the same order
+    #       as `GitRepo.get_tags()`
+    for ref_info in ds.repo.for_each_ref_(
+        fields=["refname", "objectname", "object", "authordate:iso8601-strict"],
+        pattern=[origin_prefix, tag_prefix],
+        sort="creatordate",
+    ):
+        refname = ref_info["refname"]
+
+        if refname.startswith(tag_prefix):
+            tags.append(
+                {
+                    "name": refname[len(tag_prefix) :],
+                    # The object an annotated tag points to or
+                    # the commit of a lightweight tag
+                    "hexsha": ref_info["object"] or ref_info["objectname"],
+                }
+            )
+        elif (branch_name := refname[len(origin_prefix) :]) == "HEAD":
+            head = ref_info["objectname"]
+        else:
+            branches[branch_name] = {
+                "hexsha": ref_info["objectname"],
+                "last_commit_dt": ref_info["authordate:iso8601-strict"],
+            }
+
+    if head is None:
+        raise RuntimeError("`origin/HEAD` is not found in the given dataset")
+
+    return OriginRefInfo(head=head, branches=branches, tags=tags)
+
+
 def get_origin_default_branch(ds: Dataset) -> str:
     """
     Get the name of the default branch of the origin remote of a given dataset
@@ -141,7 +306,7 @@ def get_origin_default_branch(ds: Dataset) -> str:
     """
     ls_remote_output = ds.repo.call_git(["ls-remote", "--symref", "origin", "HEAD"])
 
-    match = re.search(r"ref: refs/heads/(\S+)\s+HEAD", ls_remote_output)
+    match = _ORIGIN_DEFAULT_BRANCH_PATTERN.match(ls_remote_output)
 
     if match is None:
         raise RuntimeError(
@@ -167,7 +332,7 @@ def get_origin_upstream_branch(ds: Dataset) -> str:
         ["rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"]
     )
 
-    match = re.search(r"origin/(\S+)", rev_parse_output)
+    match = _ORIGIN_UPSTREAM_BRANCH_PATTERN.match(rev_parse_output)
 
     if match is None:
         raise RuntimeError(
@@ -1,6 +1,7 @@
 # Module for defining useful tools for use with Pydantic
 
 from pathlib import Path
+from typing import Any
 
 
 def path_must_be_absolute(p: Path) -> Path:
@@ -13,3 +14,16 @@ def path_must_be_absolute(p: Path) -> Path:
     if not p.is_absolute():
         raise ValueError("Path must be absolute")
     return p
+
+
+def path_url_must_be_absolute(url: Any) -> Any:
+    """
+    Pydantic validator for ensuring that a URL that is expressed as a path,
+    as opposed to a URL of a network location, is absolute
+    :param url: The URL to validate
+    :return: The URL if it is not a path or if it is an absolute path
+    :raises ValueError: If the URL is a path and the path is not absolute
+    """
+    if isinstance(url, Path) and not url.is_absolute():
+        raise ValueError("Path URLs must be absolute")
+    return url
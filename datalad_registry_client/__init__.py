@@ -4,6 +4,11 @@ from importlib.metadata import version
 # that the client interacts with.
 DEFAULT_BASE_ENDPOINT = "http://127.0.0.1:5000/api/v2"
 
+# The default timeouts, in seconds, for connecting to and for reading from
+# the DataLad Registry instance that the client interacts with.
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 30.0
+
 command_suite = (
     "Interact with DataLad registry",
     [
@@ -15,7 +15,7 @@ from yarl import URL
 from datalad_registry.blueprints.api import DATASET_URLS_PATH
 
 from . import DEFAULT_BASE_ENDPOINT
-from .utils import get_base_endpoint
+from .utils import get_base_endpoint, get_timeout
 
 lgr = logging.getLogger("datalad.registry.get_urls")
 
@@ -84,10 +84,12 @@ class RegistryGetURLs(Interface):
             endpoint=endpoint.human_repr(),
         )
 
+        timeout = get_timeout()
+
         ds_urls: list[str] = []  # For storing returned dataset URLs from the server
         with requests.Session() as session:
             while True:
-                resp = session.get(str(target_url))
+                resp = session.get(str(target_url), timeout=timeout)
 
                 resp_status_code = resp.status_code
 
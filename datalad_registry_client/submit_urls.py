@@ -1,4 +1,8 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 import logging
+import threading
 from typing import Any, Dict, Iterator, List, Optional
 
 from datalad.interface.base import Interface, build_doc, eval_results
@@ -11,10 +15,13 @@ from yarl import URL
 from datalad_registry.blueprints.api import DATASET_URLS_PATH
 
 from . import DEFAULT_BASE_ENDPOINT
-from .utils import get_base_endpoint
+from .utils import get_base_endpoint, get_timeout
 
 lgr = logging.getLogger("datalad.registry.submit_urls")
 
+# The maximum number of URLs that are submitted to the server concurrently
+_MAX_CONCURRENT_SUBMISSIONS = 8
+
 
 @build_doc
 class RegistrySubmitURLs(Interface):
@@ -57,62 +64,126 @@ class RegistrySubmitURLs(Interface):
             endpoint=endpoint.human_repr(),
         )
 
-        with requests.Session() as session:
-            for url in urls:
-                resp = session.post(endpoint_str, json={"url": url})
-
-                res_base.update(URL=url)
-
-                resp_status_code = resp.status_code
-                if resp_status_code == 201:
-                    yield get_status_dict(
-                        **res_base,
-                        status="ok",
-                        message=("Registered %s", url),
-                    )
-                elif resp_status_code == 404:
-                    yield get_status_dict(
-                        **res_base,
-                        status="error",
-                        error_message=(
-                            "Submitted URL: %s; " "Incorrect endpoint: %s",
-                            url,
-                            endpoint_str,
-                        ),
-                    )
-                elif resp_status_code == 409:
-                    yield get_status_dict(
-                        **res_base,
-                        status="error",
-                        error_message=("The URL, %s, is already registered", url),
-                    )
-                elif resp_status_code == 422:
-                    yield get_status_dict(
-                        **res_base,
-                        status="error",
-                        error_message=(
-                            "Submitted URL: %s; "
-                            "Unprocessable argument(s) to server: %s",
-                            url,
-                            resp.text,
-                        ),
-                    )
-                elif resp_status_code == 500:
-                    yield get_status_dict(
-                        **res_base,
-                        status="error",
-                        error_message=("Submitted URL: %s; " "Server Error", url),
-                    )
-                else:
-                    yield get_status_dict(
-                        **res_base,
-                        status="error",
-                        error_message=(
-                            "Submitted URL: %s; "
-                            "Server HTTP response code: %s; "
-                            "Message from server: %s",
-                            url,
-                            resp_status_code,
-                            resp.text,
-                        ),
-                    )
+        timeout = get_timeout()
+
+        # Each URL is submitted only once, even if it is given multiple times
+        urls = list(dict.fromkeys(urls))
+
+        # The session is shared by the worker threads. This is safe for the requests
+        # made here since the connection pools of the session are thread-safe, and
+        # its cookie jar guards its state with a lock.
+        with requests.Session() as session, ThreadPoolExecutor(
+            max_workers=_MAX_CONCURRENT_SUBMISSIONS
+        ) as executor:
+
+            # Set once a response other than 201 has been received, or once
+            # the results stop being consumed. A submission that has not started
+            # its POST by then is held back, i.e., its future resolves to `None`
+            # without anything being sent, so that the URLs after a failure are not
+            # registered when the command stops at the failure.
+            hold_submissions = threading.Event()
+
+            def post(u: str) -> Optional[requests.Response]:
+                if hold_submissions.is_set():
+                    return None
+
+                r = session.post(endpoint_str, json={"url": u}, timeout=timeout)
+                if r.status_code != 201:
+                    hold_submissions.set()
+                return r
+
+            def submit(u: str) -> Future:
+                return executor.submit(post, u)
+
+            url_itr = iter(urls)
+
+            # The URLs being submitted, each paired with the future of its response,
+            # in the order of the URLs. At most `_MAX_CONCURRENT_SUBMISSIONS` URLs
+            # are in the window at any time.
+            window: deque[tuple[str, Future]] = deque(
+                (u, submit(u)) for u in islice(url_itr, _MAX_CONCURRENT_SUBMISSIONS)
+            )
+
+            try:
+                while window:
+                    url, resp_future = window.popleft()
+                    resp = resp_future.result()
+                    if resp is None:
+                        # The submission of the URL has been held back. Since all
+                        # the results before it have been consumed, submit it now.
+                        resp = session.post(
+                            endpoint_str, json={"url": url}, timeout=timeout
+                        )
+
+                    res_base.update(URL=url)
+
+                    resp_status_code = resp.status_code
+                    if resp_status_code == 201:
+                        yield get_status_dict(
+                            **res_base,
+                            status="ok",
+                            message=("Registered %s", url),
+                        )
+                    elif resp_status_code == 404:
+                        yield get_status_dict(
+                            **res_base,
+                            status="error",
+                            error_message=(
+                                "Submitted URL: %s; " "Incorrect endpoint: %s",
+                                url,
+                                endpoint_str,
+                            ),
+                        )
+                    elif resp_status_code == 409:
+                        yield get_status_dict(
+                            **res_base,
+                            status="error",
+                            error_message=("The URL, %s, is already registered", url),
+                        )
+                    elif resp_status_code == 422:
+                        yield get_status_dict(
+                            **res_base,
+                            status="error",
+                            error_message=(
+                                "Submitted URL: %s; "
+                                "Unprocessable argument(s) to server: %s",
+                                url,
+                                resp.text,
+                            ),
+                        )
+                    elif resp_status_code == 500:
+                        yield get_status_dict(
+                            **res_base,
+                            status="error",
+                            error_message=("Submitted URL: %s; " "Server Error", url),
+                        )
+                    else:
+                        yield get_status_dict(
+                            **res_base,
+                            status="error",
+                            error_message=(
+                                "Submitted URL: %s; "
+                                "Server HTTP response code: %s; "
+                                "Message from server: %s",
+                                url,
+                                resp_status_code,
+                                resp.text,
+                            ),
+                        )
+
+                    # The consumption of the results continues past a failure,
+                    # e.g., with `on_failure="continue"`. Resume the submissions.
+                    if resp_status_code != 201:
+                        hold_submissions.clear()
+
+                    # Submit the next URL only after the result for the current one
+                    # has been consumed so that no further URL is submitted once
+                    # the consumption stops, e.g., at the first failure with
+                    # `on_failure="stop"`
+                    next_url = next(url_itr, None)
+                    if next_url is not None:
+                        window.append((next_url, submit(next_url)))
+            finally:
+                # Hold back the submissions in the window that have not started
+                # their POSTs when the consumption of the results stops early
+                hold_submissions.set()
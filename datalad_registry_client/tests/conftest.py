@@ -0,0 +1,25 @@
+import pytest
+import requests
+
+
+@pytest.fixture(autouse=True)
+def block_http_requests(request, monkeypatch):
+    """
+    Block any HTTP request that is about to be sent over the network by `requests`
+    in the tests of the client, except for those marked with `devserver`
+
+    Note: The HTTP requests are blocked at `requests.adapters.HTTPAdapter.send`.
+          A test mocking the HTTP layer, either by replacing methods of
+          `requests.Session` or with the `responses` library, is not affected.
+    """
+
+    if "devserver" in request.keywords:
+        return
+
+    # noinspection PyUnusedLocal
+    def blocked_send(self, req, *args, **kwargs):  # noqa: U100 Unused argument
+        raise RuntimeError(
+            f"Unexpected HTTP request in a test of the client: {req.method} {req.url}"
+        )
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", blocked_send)
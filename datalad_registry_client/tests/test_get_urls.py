@@ -93,7 +93,7 @@ class TestRegistryGetURLs:
         """
 
         # noinspection PyUnusedLocal
-        def mock_get(s, url):  # noqa: U100 Unused argument
+        def mock_get(s, url, timeout=None):  # noqa: U100 Unused argument
             requested_endpoint = str(URL(url).with_query({}))
             if requested_endpoint == endpoint:
                 # noinspection PyTypeChecker
@@ -145,7 +145,7 @@ class TestRegistryGetURLs:
         """
 
         # noinspection PyUnusedLocal
-        def mock_get(s, url):  # noqa: U100 Unused argument
+        def mock_get(s, url, timeout=None):  # noqa: U100 Unused argument
             if URL(url).query == MultiDict(cache_path=cache_path):
                 # noinspection PyTypeChecker
                 return MockResponse(
@@ -216,7 +216,7 @@ class TestRegistryGetURLs:
         ds_url_pgs_iter = ds_url_pgs()
 
         # noinspection PyUnusedLocal
-        def mock_get(s, url):  # noqa: U100 Unused argument
+        def mock_get(s, url, timeout=None):  # noqa: U100 Unused argument
             # noinspection PyTypeChecker
             return MockResponse(
                 200,
@@ -282,7 +282,7 @@ class TestRegistryGetURLs:
         mock_resp_iter = mock_responses()
 
         # noinspection PyUnusedLocal
-        def mock_get(s, url):  # noqa: U100 Unused argument
+        def mock_get(s, url, timeout=None):  # noqa: U100 Unused argument
             try:
                 mock_resp = next(mock_resp_iter)
             except StopIteration:
@@ -1,9 +1,22 @@
+import json
+import re
+
 from datalad import api as dl
 from datalad.support.exceptions import IncompleteResultsError
+from datalad.tests.utils_pytest import patch_config
 import pytest
 import requests
+import responses
+
+from datalad_registry_client import (
+    DEFAULT_BASE_ENDPOINT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+)
+from datalad_registry_client.submit_urls import _MAX_CONCURRENT_SUBMISSIONS
 
-from datalad_registry_client import DEFAULT_BASE_ENDPOINT
+# The command under test, looked up in `datalad.api` once for the module
+registry_submit_urls = dl.registry_submit_urls
 
 
 def test_register():
@@ -42,42 +55,44 @@ class TestRegistrySubmitURLs:
             ("http://127.0.0.1:5000/api///", "http://127.0.0.1:5000/api/dataset-urls"),
         ],
     )
-    def test_endpoint_construction(self, base_endpoint, endpoint, monkeypatch):
+    @responses.activate
+    def test_endpoint_construction(self, base_endpoint, endpoint):
         """
         Verify the correctness of the endpoint construction.
         """
 
-        # noinspection PyUnusedLocal
-        def mock_post(s, url, json=None):  # noqa: U100 Unused argument
-            if url == endpoint:
-                return MockResponse(201, "Created")
-            else:
-                return MockResponse(404, "Not Found")
-
-        monkeypatch.setattr(requests.Session, "post", mock_post)
+        # Only a submission to the expected endpoint is responded to. A request to
+        # any other URL fails with a connection error.
+        responses.post(endpoint, status=201, body="Created")
 
         if base_endpoint is not None:
-            res = dl.registry_submit_urls(
+            res = registry_submit_urls(
                 urls=["http://example.test"], base_endpoint=base_endpoint
             )
         else:
-            res = dl.registry_submit_urls(urls=["http://example.test"])
+            res = registry_submit_urls(urls=["http://example.test"])
 
         assert len(res) == 1
         assert res[0]["status"] == "ok"
 
-    def test_handle_successful_response(self, monkeypatch):
+        assert len(responses.calls) == 1
+        assert responses.calls[0].request.url == endpoint
+
+    @responses.activate
+    def test_handle_successful_response(self):
         """
         Test handling of a successful response from the server
         """
-
-        # noinspection PyUnusedLocal
-        def mock_post(s, url, json=None):  # noqa: U100 Unused argument
-            return MockResponse(201, "Created")
-
-        monkeypatch.setattr(requests.Session, "post", mock_post)
-
-        res = dl.registry_submit_urls(urls=["http://example.test"])
+        responses.post(
+            DEFAULT_BASE_ENDPOINT + "/dataset-urls",
+            status=201,
+            body="Created",
+            match=[
+                responses.matchers.json_params_matcher({"url": "http://example.test"})
+            ],
+        )
+
+        res = registry_submit_urls(urls=["http://example.test"])
         assert len(res) == 1
         assert res[0]["status"] == "ok"
         assert "message" in res[0]
@@ -102,13 +117,13 @@ class TestRegistrySubmitURLs:
         """
 
         # noinspection PyUnusedLocal
-        def mock_post(s, url, json=None):  # noqa: U100 Unused argument
+        def mock_post(s, url, json=None, timeout=None):  # noqa: U100 Unused argument
             return MockResponse(status_code, "")
 
         monkeypatch.setattr(requests.Session, "post", mock_post)
 
         with pytest.raises(IncompleteResultsError, match=msg_content) as exc_info:
-            dl.registry_submit_urls(urls=["http://example.test"])
+            registry_submit_urls(urls=["http://example.test"])
 
         assert len(exc_info.value.failed) == 1
         assert exc_info.value.failed[0]["status"] == "error"
@@ -129,7 +144,7 @@ class TestRegistrySubmitURLs:
         urls_in_set = set(urls)
 
         # noinspection PyUnusedLocal
-        def mock_post(s, url, json=None):  # noqa: U100 Unused argument
+        def mock_post(s, url, json=None, timeout=None):  # noqa: U100 Unused argument
 
             submitted_url = json["url"]
 
@@ -143,8 +158,160 @@ class TestRegistrySubmitURLs:
 
         monkeypatch.setattr(requests.Session, "post", mock_post)
 
-        res = dl.registry_submit_urls(urls=urls)
+        res = registry_submit_urls(urls=urls)
 
         assert len(res) == len(urls)
         assert all(r["status"] == "ok" for r in res)
+
+        # The results are in the order of the submitted URLs
+        assert [r["URL"] for r in res] == urls
         assert len(urls_in_set) == 0
+
+    def test_duplicate_urls(self, monkeypatch):
+        """
+        Test a submission of multiple URLs that includes duplicates
+        """
+
+        submitted_urls = []
+
+        # noinspection PyUnusedLocal
+        def mock_post(s, url, json=None, timeout=None):  # noqa: U100 Unused argument
+            submitted_urls.append(json["url"])
+            return MockResponse(201, "Created")
+
+        monkeypatch.setattr(requests.Session, "post", mock_post)
+
+        res = registry_submit_urls(
+            urls=[
+                "http://example.test",
+                "https://www.datalad.org",
+                "http://example.test",
+            ]
+        )
+
+        distinct_urls = ["http://example.test", "https://www.datalad.org"]
+
+        # Each distinct URL is submitted once
+        # (in no particular order since the URLs are submitted concurrently)
+        assert sorted(submitted_urls) == sorted(distinct_urls)
+
+        # A result is produced for each distinct URL, in the order of its first
+        # appearance
+        assert [r["URL"] for r in res] == distinct_urls
+
+    @pytest.mark.parametrize("failing_idx", [0, 10, 39])
+    @responses.activate
+    def test_stop_on_failure(self, failing_idx):
+        """
+        Test that no URL beyond the window of concurrent submissions at the time of
+        a failure is submitted when the command is to stop at the first failure
+
+        :param failing_idx: The index of the URL whose submission fails
+        """
+        urls = [f"https://example.test/{i}" for i in range(40)]
+        failing_url = urls[failing_idx]
+
+        def request_callback(request):
+            if json.loads(request.body)["url"] == failing_url:
+                return 500, {}, "Internal Server Error"
+            return 201, {}, "Created"
+
+        responses.add_callback(
+            responses.POST,
+            DEFAULT_BASE_ENDPOINT + "/dataset-urls",
+            callback=request_callback,
+        )
+
+        with pytest.raises(IncompleteResultsError, match="Server Error") as exc_info:
+            registry_submit_urls(urls=urls, on_failure="stop")
+
+        assert len(exc_info.value.failed) == 1
+        assert exc_info.value.failed[0]["URL"] == failing_url
+
+        requested_idxs = [
+            urls.index(json.loads(c.request.body)["url"]) for c in responses.calls
+        ]
+
+        # Every URL up to the failing one is submitted exactly once
+        assert sorted(i for i in requested_idxs if i <= failing_idx) == list(
+            range(failing_idx + 1)
+        )
+
+        # Only the URLs sharing the window of concurrent submissions with the
+        # failing URL can be submitted after it, and none beyond
+        idxs_after_failure = [i for i in requested_idxs if i > failing_idx]
+        assert len(idxs_after_failure) == len(set(idxs_after_failure))
+        assert len(idxs_after_failure) <= _MAX_CONCURRENT_SUBMISSIONS - 1
+        assert all(
+            i < failing_idx + _MAX_CONCURRENT_SUBMISSIONS for i in idxs_after_failure
+        )
+
+    @responses.activate
+    def test_continue_on_failure(self):
+        """
+        Test that every URL is submitted exactly once, and has its result, when
+        the command is to continue past failures
+        """
+        urls = [f"https://example.test/{i}" for i in range(40)]
+        failing_urls = {urls[3], urls[10], urls[11]}
+
+        def request_callback(request):
+            if json.loads(request.body)["url"] in failing_urls:
+                return 500, {}, "Internal Server Error"
+            return 201, {}, "Created"
+
+        responses.add_callback(
+            responses.POST,
+            DEFAULT_BASE_ENDPOINT + "/dataset-urls",
+            callback=request_callback,
+        )
+
+        with pytest.raises(IncompleteResultsError) as exc_info:
+            registry_submit_urls(urls=urls, on_failure="continue")
+
+        assert {r["URL"] for r in exc_info.value.failed} == failing_urls
+        assert sorted(json.loads(c.request.body)["url"] for c in responses.calls) == (
+            sorted(urls)
+        )
+
+    def test_timeout(self, monkeypatch):
+        """
+        Test that the submission is made with the default timeouts
+        """
+
+        timeouts = []
+
+        # noinspection PyUnusedLocal
+        def mock_post(s, url, json=None, timeout=None):  # noqa: U100 Unused argument
+            timeouts.append(timeout)
+            return MockResponse(201, "Created")
+
+        monkeypatch.setattr(requests.Session, "post", mock_post)
+
+        registry_submit_urls(urls=["http://example.test"])
+
+        assert timeouts == [(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)]
+
+    @pytest.mark.parametrize(
+        "option", ["datalad_registry.connect_timeout", "datalad_registry.read_timeout"]
+    )
+    def test_invalid_timeout(self, option, monkeypatch):
+        """
+        Test that a timeout option set to a value that is not a number is reported
+        by name before any submission
+        """
+
+        submitted_urls = []
+
+        # noinspection PyUnusedLocal
+        def mock_post(s, url, json=None, timeout=None):  # noqa: U100 Unused argument
+            submitted_urls.append(json["url"])
+            return MockResponse(201, "Created")
+
+        monkeypatch.setattr(requests.Session, "post", mock_post)
+
+        with patch_config({option: "three seconds"}):
+            with pytest.raises(ValueError, match=re.escape(option)):
+                registry_submit_urls(urls=["http://example.test"])
+
+        assert submitted_urls == []
@@ -2,7 +2,7 @@
 
 from datalad import cfg
 
-from . import DEFAULT_BASE_ENDPOINT
+from . import DEFAULT_BASE_ENDPOINT, DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
 
 
 def get_base_endpoint() -> str:
@@ -11,3 +11,40 @@ def get_base_endpoint() -> str:
              or the value of `datalad_registry_client.DEFAULT_BASE_ENDPOINT` otherwise.
     """
     return cfg.get("datalad_registry.base_endpoint", DEFAULT_BASE_ENDPOINT)
+
+
+def get_timeout() -> tuple[float, float]:
+    """
+    :return: The timeouts, in seconds, for requests to the DataLad Registry instance
+             as a tuple of the connect timeout and the read timeout, which are
+             the values of the `datalad_registry.connect_timeout` and
+             `datalad_registry.read_timeout` options if set, or the values of
+             `datalad_registry_client.DEFAULT_CONNECT_TIMEOUT` and
+             `datalad_registry_client.DEFAULT_READ_TIMEOUT` otherwise.
+    :raises ValueError: If either option is set to a value that is not a number
+    """
+    return (
+        _get_timeout_option(
+            "datalad_registry.connect_timeout", DEFAULT_CONNECT_TIMEOUT
+        ),
+        _get_timeout_option("datalad_registry.read_timeout", DEFAULT_READ_TIMEOUT),
+    )
+
+
+def _get_timeout_option(name: str, default: float) -> float:
+    """
+    :param name: The name of the configuration option specifying a timeout
+    :param default: The timeout to use if the option is not set
+    :return: The timeout, in seconds, specified by the option if set,
+             or the given default otherwise
+    :raises ValueError: If the option is set to a value that is not a number,
+                        including if it is set more than once
+    """
+    value = cfg.get(name, default)
+    try:
+        return float(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(
+            f"Invalid value for the configuration option {name}: {value!r}. "
+            f"The value must be a number of seconds."
+        ) from e
@@ -0,0 +1,40 @@
+"""Add indexes on `repo_url` for the listing of dataset URLs
+
+Revision ID: 3c8558fcbd69
+Revises: 5b8d2e4f7a61
+Create Date: 2026-10-15 18:41:09.527163
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "3c8558fcbd69"
+down_revision = "5b8d2e4f7a61"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("repo_url", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_repo_url_last_update_dt_desc_nulls_last",
+            [sa.text("last_update_dt DESC NULLS LAST")],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_repo_url_annexed_files_in_wt_size_not_null",
+            ["annexed_files_in_wt_size"],
+            unique=False,
+            postgresql_where=sa.text("annexed_files_in_wt_size IS NOT NULL"),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("repo_url", schema=None) as batch_op:
+        batch_op.drop_index(
+            "ix_repo_url_annexed_files_in_wt_size_not_null",
+            postgresql_where=sa.text("annexed_files_in_wt_size IS NOT NULL"),
+        )
+        batch_op.drop_index("ix_repo_url_last_update_dt_desc_nulls_last")
@@ -0,0 +1,34 @@
+"""Add partial index on `repo_url.ds_id`
+
+Revision ID: 3f1e5a0c9b2d
+Revises: 7d283978c4a9
+Create Date: 2026-10-15 09:12:41.530217
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "3f1e5a0c9b2d"
+down_revision = "7d283978c4a9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("repo_url", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_repo_url_ds_id_not_null",
+            ["ds_id"],
+            unique=False,
+            postgresql_where=sa.text("ds_id IS NOT NULL"),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("repo_url", schema=None) as batch_op:
+        batch_op.drop_index(
+            "ix_repo_url_ds_id_not_null",
+            postgresql_where=sa.text("ds_id IS NOT NULL"),
+        )
@@ -0,0 +1,29 @@
+"""Add index on `url_metadata.url_id` and `url_metadata.extractor_name`
+
+Revision ID: 5b8d2e4f7a61
+Revises: 3f1e5a0c9b2d
+Create Date: 2026-10-15 16:05:27.318904
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b8d2e4f7a61"
+down_revision = "3f1e5a0c9b2d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("url_metadata", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_url_metadata_url_id_extractor_name",
+            ["url_id", "extractor_name"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("url_metadata", schema=None) as batch_op:
+        batch_op.drop_index("ix_url_metadata_url_id_extractor_name")